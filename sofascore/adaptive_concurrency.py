@@ -0,0 +1,115 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Iterable, Optional
+
+DEFAULT_RETRY_STATUSES = (403, 429, 430, 500, 502, 503)
+# Request windows for every SofaScore client in the repo. Live-board tools
+# (tvmap, ChannelDatabase) use the defaults; the bulk harvesters run for hours
+# across many endpoints and start lower and cap lower
+DEFAULT_CONCURRENCY = 8
+DEFAULT_MAX_CONCURRENCY = 32
+HARVEST_CONCURRENCY = 2
+HARVEST_MAX_CONCURRENCY = 8
+DEFAULT_MIN_LIMIT = 1
+DEFAULT_DECREASE = 0.5
+
+
+def extract_status_code(exc: BaseException) -> Optional[int]:
+    """HTTP status from the wrapper's ``Failed to fetch <endpoint>: <status>`` errors."""
+    message = str(exc)
+    if ":" not in message:
+        return None
+    tail = message.rsplit(":", 1)[-1].strip()
+    return int(tail) if tail.isdigit() else None
+
+
+class AdaptiveConcurrency:
+    """AIMD limit on in-flight SofaScore requests.
+
+    Every successful response grows the window by ``1 / window`` (about +1 per
+    window's worth of successes). A throttling status (``backoff_statuses`` or
+    any 5xx) or a timeout multiplies it by ``decrease``. Failures from requests
+    that started before the last cut are ignored, so one burst of 429s halves
+    the window once instead of collapsing it. Other errors (404s) leave it alone.
+    """
+
+    def __init__(
+        self,
+        initial: int = DEFAULT_CONCURRENCY,
+        minimum: int = DEFAULT_MIN_LIMIT,
+        maximum: int = DEFAULT_MAX_CONCURRENCY,
+        *,
+        decrease: float = DEFAULT_DECREASE,
+        backoff_statuses: Iterable[int] = DEFAULT_RETRY_STATUSES,
+        metrics: Any = None,
+        name: str = "sofascore",
+    ):
+        self.minimum = max(1, int(minimum))
+        self.maximum = max(self.minimum, int(maximum))
+        self.limit = float(min(self.maximum, max(self.minimum, int(initial))))
+        self.decrease = decrease
+        self.backoff_statuses = frozenset(int(code) for code in backoff_statuses)
+        self.metrics = metrics
+        self.name = name
+        self.in_flight = 0
+        self.backoffs = 0
+        self._generation = 0
+        self._condition: Optional[asyncio.Condition] = None
+        self._publish()
+
+    @property
+    def window(self) -> int:
+        return int(self.limit)
+
+    def is_backoff(self, exc: BaseException) -> bool:
+        if isinstance(exc, asyncio.TimeoutError):
+            return True
+        status = extract_status_code(exc)
+        return status is not None and (status in self.backoff_statuses or status >= 500)
+
+    async def acquire(self) -> int:
+        """Wait for a free slot; returns the generation the request started in."""
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.window)
+            self.in_flight += 1
+            self._publish()
+            return self._generation
+
+    async def release(self, generation: int, outcome: Optional[bool]) -> None:
+        """Free a slot: ``True`` = healthy response, ``False`` = back off, ``None`` = neutral."""
+        assert self._condition is not None
+        async with self._condition:
+            self.in_flight -= 1
+            if outcome:
+                self.limit = min(float(self.maximum), self.limit + 1.0 / self.limit)
+            elif outcome is False and generation == self._generation:
+                self.limit = max(float(self.minimum), self.limit * self.decrease)
+                self._generation += 1
+                self.backoffs += 1
+                if self.metrics is not None:
+                    self.metrics.incr("concurrency_backoffs_total", self.name)
+            self._publish()
+            self._condition.notify_all()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one slot for a request, classifying how it ended."""
+        generation = await self.acquire()
+        outcome: Optional[bool] = True
+        try:
+            yield
+        except asyncio.CancelledError:
+            outcome = None
+            raise
+        except Exception as exc:  # noqa: BLE001
+            outcome = False if self.is_backoff(exc) else None
+            raise
+        finally:
+            await asyncio.shield(self.release(generation, outcome))
+
+    def _publish(self) -> None:
+        if self.metrics is not None:
+            self.metrics.set_gauge("concurrency_limit", self.name, self.window)
+            self.metrics.set_gauge("concurrency_in_flight", self.name, self.in_flight)
@@ -0,0 +1,33 @@
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator, Union
+
+PathLike = Union[str, Path]
+
+
+def temp_path_for(path: PathLike) -> Path:
+    """Per-process scratch name next to ``path``, so concurrent writers don't share one."""
+    target = Path(path)
+    return target.with_name(f"{target.name}.{os.getpid()}.tmp")
+
+
+@contextmanager
+def atomic_write(path: PathLike, mode: str = "w", fsync: bool = False) -> Iterator[IO]:
+    """Write to a file next to ``path`` and rename it over ``path`` when the block succeeds.
+
+    Readers see the old file or the complete new one, never a partial write.
+    If the block raises, ``path`` is left alone and the scratch file removed.
+    """
+    target = Path(path)
+    tmp_path = temp_path_for(target)
+    try:
+        with open(tmp_path, mode, encoding=None if "b" in mode else "utf-8") as handle:
+            yield handle
+            if fsync:
+                handle.flush()
+                os.fsync(handle.fileno())
+        os.replace(tmp_path, target)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
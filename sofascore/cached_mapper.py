@@ -9,14 +9,26 @@ import sys
 from datetime import datetime
 from pathlib import Path
 from sofascore_wrapper.match import Match
-from sofascore_wrapper.api import SofascoreAPI
+
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from sofascore.adaptive_concurrency import DEFAULT_CONCURRENCY, DEFAULT_MAX_CONCURRENCY, AdaptiveConcurrency
+from sofascore.channel_search import DEFAULT_SEARCH_LIMIT, ChannelSearchIndex
+from sofascore.journaled_store import JournaledStore
+from sofascore.session import shared_sessions
 
 
 class ChannelDatabase:
-    def __init__(self, db_path='data/channels_database.json', countries_path='data/geolite2_countries.json'):
+    def __init__(self, db_path='data/channels_database.json', countries_path='data/geolite2_countries.json',
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY):
         self.db_path = db_path
         self.countries_path = countries_path
-        self.api = SofascoreAPI()
+        self.max_concurrency = max_concurrency
+        # Borrowed from the process-wide pooled session, with a page per request the
+        # adaptive window may allow; close() hands it back
+        self.api = shared_sessions.acquire(max_concurrency)
+        self._search_index = None
         
         # Load country mapping
         self.countries = self._load_countries()
@@ -38,6 +50,14 @@ class ChannelDatabase:
             'channels': {},  # channel_id -> {id, name, countries[], first_seen}
             'country_channels': {}  # country_code -> [channel_ids]
         }
+        # Working copies of the two list-valued tables as sets, for O(1) inserts and
+        # membership checks; written back as sorted lists when the file is compacted
+        self.country_index = {}  # country_code -> {channel_id}
+        self.channel_countries = {}  # str(channel_id) -> {country_code}
+        # Saves append only what changed since the last one (see JournaledStore)
+        self.store = JournaledStore(db_path)
+        self._changed_channels = set()  # str(channel_id)
+        self._new_country_channels = {}  # country_code -> {channel_id}
         
         # Load existing database
         self._load_database()
@@ -72,10 +92,12 @@ class ChannelDatabase:
     def _load_database(self):
         """Load existing channel database"""
         try:
-            with open(self.db_path, 'r', encoding='utf-8') as f:
-                self.channels_db = json.load(f)
+            self.channels_db = self.store.load()
+            self._build_indexes()
             
             print(f"✅ Loaded existing database: {self.channels_db['metadata']['total_channels']} channels")
+            if self.store.replayed:
+                print(f"📓 Replayed {self.store.replayed} journaled changes")
             return True
             
         except FileNotFoundError:
@@ -85,68 +107,140 @@ class ChannelDatabase:
             print(f"❌ Error loading database: {e}")
             return False
     
-    def _save_database(self):
-        """Save channel database to file"""
+    def _build_indexes(self):
+        """Load the set indexes from the saved country and channel lists"""
+        self.country_index = {
+            country_code: {int(channel_id) for channel_id in channel_ids}
+            for country_code, channel_ids in self.channels_db.get('country_channels', {}).items()
+        }
+        self.channel_countries = {
+            channel_str: set(channel_info.get('countries', []))
+            for channel_str, channel_info in self.channels_db['channels'].items()
+        }
+    
+    def _write_indexes(self):
+        """Serialize the set indexes back into the database as sorted lists"""
+        self.channels_db['country_channels'] = {
+            country_code: sorted(self.country_index[country_code]) for country_code in sorted(self.country_index)
+        }
+        for channel_str, channel_info in self.channels_db['channels'].items():
+            channel_info['countries'] = sorted(self.channel_countries.get(channel_str, ()))
+    
+    def _channel_record(self, channel_str):
+        """Copy of a channel record with its current country list"""
+        channel_info = self.channels_db['channels'][channel_str].copy()
+        channel_info['countries'] = sorted(self.channel_countries.get(channel_str, ()))
+        return channel_info
+    
+    def _snapshot(self):
+        """The full database, as written when the journal is compacted"""
+        self._write_indexes()
+        return self.channels_db
+    
+    def _save_database(self, compact=False):
+        """Journal the channels and countries changed since the last save"""
         try:
             # Update metadata
             self.channels_db['metadata']['updated_at'] = datetime.now().isoformat()
             self.channels_db['metadata']['total_channels'] = len(self.channels_db['channels'])
-            self.channels_db['metadata']['countries_with_channels'] = list(self.channels_db['country_channels'].keys())
+            self.channels_db['metadata']['countries_with_channels'] = sorted(self.country_index)
+            
+            for channel_str in self._changed_channels:
+                self.store.set_item('channels', channel_str, self._channel_record(channel_str))
+            for country_code, channel_ids in self._new_country_channels.items():
+                self.store.add_members('country_channels', country_code, channel_ids)
+            changes = len(self._changed_channels) + len(self._new_country_channels)
+            self.store.set_table('metadata', self.channels_db['metadata'])
             
-            with open(self.db_path, 'w', encoding='utf-8') as f:
-                json.dump(self.channels_db, f, indent=2, ensure_ascii=False)
+            if compact:
+                self.store.compact(self._snapshot())
+                compacted = True
+            else:
+                compacted = self.store.flush(self._snapshot)
+            self._changed_channels.clear()
+            self._new_country_channels.clear()
             
-            print(f"✅ Database saved: {self.channels_db['metadata']['total_channels']} channels")
+            if compacted:
+                print(f"✅ Database saved: {self.channels_db['metadata']['total_channels']} channels")
+            else:
+                print(f"✅ Database saved: {self.channels_db['metadata']['total_channels']} channels ({changes} changes journaled)")
             return True
             
         except Exception as e:
             print(f"❌ Error saving database: {e}")
             return False
     
-    async def get_channel_name(self, channel_id):
+    async def close(self):
+        """Release the shared SofaScore session"""
+        if self.api is not None:
+            await shared_sessions.release(self.api)
+            self.api = None
+    
+    async def get_channel_name(self, channel_id, match_id=0):
         """Get channel name, using cache first then API"""
         channel_id = int(channel_id)
         
         # Check cache first
         if str(channel_id) in self.channels_db['channels']:
-            self.channels_db['metadata']['stats']['cache_hit_rate'] = \
-                (self.channels_db['metadata']['stats']['api_requests_saved'] / 
-                 max(1, self.channels_db['metadata']['stats']['api_requests_saved'] + 
-                     self.channels_db['metadata']['stats']['channels_discovered'])) * 100
             self.channels_db['metadata']['stats']['api_requests_saved'] += 1
+            self._update_cache_hit_rate()
             return self.channels_db['channels'][str(channel_id)]['name']
         
-        # Fetch from API
+        return await self._resolve_channel(channel_id, match_id)
+    
+    async def _resolve_channel(self, channel_id, match_id=0):
+        """Fetch one unknown channel's name from the API and cache it"""
         try:
-            match_obj = Match(self.api, 0)
-            channel_info = await match_obj.get_channel(channel_id)
-            
-            if isinstance(channel_info, str):
-                channel_name = channel_info
-            elif isinstance(channel_info, dict):
-                channel_name = channel_info.get('name', f'Channel {channel_id}')
-            else:
-                channel_name = f'Channel {channel_id}'
-            
-            # Cache the result
-            self.channels_db['channels'][str(channel_id)] = {
-                'id': channel_id,
-                'name': channel_name,
-                'countries': [],
-                'first_seen': datetime.now().isoformat()
-            }
-            
-            self.channels_db['metadata']['stats']['channels_discovered'] += 1
-            
-            print(f"📺 Discovered: {channel_name} ({channel_id})")
-            return channel_name
-            
+            channel_name = await self._fetch_channel_name(channel_id, match_id)
         except Exception as e:
             print(f"⚠️ Failed to get channel {channel_id}: {e}")
             return f'Channel {channel_id}'
+        return self._cache_channel(channel_id, channel_name)
+    
+    async def _fetch_channel_name(self, channel_id, match_id=0):
+        """Channel name from the API; upstream errors propagate (the limiter backs off on them)"""
+        # The votes endpoint is scoped to an event; use one the channel was seen on
+        channel_info = await Match(self.api, match_id).get_channel(channel_id)
+        
+        if isinstance(channel_info, str):
+            return channel_info
+        if isinstance(channel_info, dict):
+            return channel_info.get('name', f'Channel {channel_id}')
+        return f'Channel {channel_id}'
+    
+    def _cache_channel(self, channel_id, channel_name):
+        """Record a newly discovered channel"""
+        self.channels_db['channels'][str(channel_id)] = {
+            'id': channel_id,
+            'name': channel_name,
+            'countries': [],
+            'first_seen': datetime.now().isoformat()
+        }
+        self._changed_channels.add(str(channel_id))
+        
+        self.channels_db['metadata']['stats']['channels_discovered'] += 1
+        
+        print(f"📺 Discovered: {channel_name} ({channel_id})")
+        return channel_name
+    
+    def _update_cache_hit_rate(self):
+        stats = self.channels_db['metadata']['stats']
+        stats['cache_hit_rate'] = (stats['api_requests_saved'] /
+                                   max(1, stats['api_requests_saved'] + stats['channels_discovered'])) * 100
     
-    async def process_live_events(self, limit=30):
-        """Process live events to build channel database"""
+    async def process_live_events(self, limit=30, concurrency=DEFAULT_CONCURRENCY, max_concurrency=None):
+        """Process live events to build channel database.
+        
+        Runs in two passes: every match's channel listing is fetched concurrently,
+        then each channel id the database doesn't know yet is resolved exactly once,
+        also concurrently. Both passes share one adaptive concurrency window.
+        """
+        maximum = max(concurrency, max_concurrency or self.max_concurrency)
+        if maximum > self.max_concurrency:
+            # Slots past the pool size would only queue inside the client and skew AIMD
+            shared_sessions.configure(pool_size=maximum)
+            self.max_concurrency = maximum
+        limiter = AdaptiveConcurrency(initial=concurrency, maximum=maximum)
         try:
             match_obj = Match(self.api, 0)
             live_games_data = await match_obj.live_games()
@@ -159,27 +253,57 @@ class ChannelDatabase:
             if not self.channels_db['metadata']['created_at']:
                 self.channels_db['metadata']['created_at'] = datetime.now().isoformat()
             
-            for i, game in enumerate(games_to_process, 1):
+            async def fetch_match_channels(i, game):
+                match_id = game.get('id')
+                if not match_id:
+                    return None
                 try:
-                    match_id = game.get('id')
-                    if not match_id:
-                        continue
-                    
-                    home_team = game.get('homeTeam', {}).get('name', 'Unknown')
-                    away_team = game.get('awayTeam', {}).get('name', 'Unknown')
-                    print(f"[{i}/{len(games_to_process)}] {home_team} vs {away_team}")
-                    
-                    match = Match(self.api, match_id)
-                    channels_data = await match.match_channels()
-                    
-                    if isinstance(channels_data, dict) and 'countryChannels' in channels_data:
-                        await self._process_match_channels(channels_data['countryChannels'])
-                    
-                    self.channels_db['metadata']['stats']['matches_processed'] += 1
-                    
+                    async with limiter.slot():
+                        channels_data = await Match(self.api, match_id).match_channels()
                 except Exception as e:
                     print(f"❌ Error processing match {match_id}: {e}")
-                    continue
+                    return None
+                
+                home_team = game.get('homeTeam', {}).get('name', 'Unknown')
+                away_team = game.get('awayTeam', {}).get('name', 'Unknown')
+                print(f"[{i}/{len(games_to_process)}] {home_team} vs {away_team}")
+                self.channels_db['metadata']['stats']['matches_processed'] += 1
+                if isinstance(channels_data, dict) and 'countryChannels' in channels_data:
+                    return match_id, channels_data['countryChannels']
+                return None
+            
+            listings = await asyncio.gather(*[
+                fetch_match_channels(i, game) for i, game in enumerate(games_to_process, 1)
+            ])
+            listings = [listing for listing in listings if listing]
+            
+            # Collect every channel id first so each unknown one costs a single request
+            seen_on = {}  # channel_id -> first match it was listed for
+            for match_id, country_channels in listings:
+                for channel_ids in country_channels.values():
+                    for channel_id in channel_ids:
+                        seen_on.setdefault(int(channel_id), match_id)
+            unknown = [channel_id for channel_id in seen_on if str(channel_id) not in self.channels_db['channels']]
+            self.channels_db['metadata']['stats']['api_requests_saved'] += len(seen_on) - len(unknown)
+            
+            if unknown:
+                print(f"🔎 Resolving {len(unknown)} new channels ({len(seen_on) - len(unknown)} already known)...")
+            
+            async def resolve(channel_id):
+                # Only the request runs inside the slot, so throttling reaches the limiter
+                try:
+                    async with limiter.slot():
+                        channel_name = await self._fetch_channel_name(channel_id, seen_on[channel_id])
+                except Exception as e:
+                    print(f"⚠️ Failed to get channel {channel_id}: {e}")
+                    return f'Channel {channel_id}'
+                return self._cache_channel(channel_id, channel_name)
+            
+            await asyncio.gather(*[resolve(channel_id) for channel_id in unknown])
+            self._update_cache_hit_rate()
+            
+            for _, country_channels in listings:
+                self._process_match_channels(country_channels)
             
             # Save after processing
             self._save_database()
@@ -188,66 +312,66 @@ class ChannelDatabase:
         except Exception as e:
             print(f"❌ Error getting live games: {e}")
     
-    async def _process_match_channels(self, country_channels):
-        """Process channels from a single match"""
+    def _process_match_channels(self, country_channels):
+        """Record a match's channels under their countries (names are resolved beforehand)"""
+        channels = self.channels_db['channels']
         for country_code, channel_ids in country_channels.items():
             country_code = country_code.upper()
-            
-            # Initialize country in database
-            if country_code not in self.channels_db['country_channels']:
-                self.channels_db['country_channels'][country_code] = []
+            country_set = self.country_index.setdefault(country_code, set())
             
             for channel_id in channel_ids:
                 channel_id = int(channel_id)
-                channel_str = str(channel_id)
+                if channel_id not in country_set:
+                    country_set.add(channel_id)
+                    self._new_country_channels.setdefault(country_code, set()).add(channel_id)
                 
-                # Get channel name (uses cache or API)
-                channel_name = await self.get_channel_name(channel_id)
-                
-                # Update channel's country list
-                if channel_str in self.channels_db['channels']:
-                    if country_code not in self.channels_db['channels'][channel_str]['countries']:
-                        self.channels_db['channels'][channel_str]['countries'].append(country_code)
-                
-                # Add to country's channel list
-                if channel_id not in self.channels_db['country_channels'][country_code]:
-                    self.channels_db['country_channels'][country_code].append(channel_id)
+                # Only channels with a resolved name carry a country list
+                channel_str = str(channel_id)
+                if channel_str in channels:
+                    countries = self.channel_countries.setdefault(channel_str, set())
+                    if country_code not in countries:
+                        countries.add(country_code)
+                        self._changed_channels.add(channel_str)
     
     def get_channels_for_country(self, country_code):
         """Get all channels for a specific country with names"""
         country_code = country_code.upper()
-        
-        if country_code not in self.channels_db['country_channels']:
-            return []
+        country_name = self.countries.get(country_code, {}).get('name', country_code)
         
         channels = []
-        for channel_id in self.channels_db['country_channels'][country_code]:
+        for channel_id in sorted(self.country_index.get(country_code, ())):
             channel_str = str(channel_id)
             if channel_str in self.channels_db['channels']:
-                channel_info = self.channels_db['channels'][channel_str].copy()
+                channel_info = self._channel_record(channel_str)
                 # Add country info
-                channel_info['country_name'] = self.countries.get(country_code, {}).get('name', country_code)
+                channel_info['country_name'] = country_name
                 channels.append(channel_info)
         
         return channels
     
-    def search_channels(self, query):
-        """Search channels by name"""
+    def search_channels(self, query, limit=DEFAULT_SEARCH_LIMIT):
+        """Search channels by name: prefix, substring and typo-tolerant, best matches first"""
         results = []
-        query = query.lower()
         
-        for channel_id, channel_info in self.channels_db['channels'].items():
-            if query in channel_info['name'].lower():
-                result = channel_info.copy()
-                # Add country names
-                result['country_names'] = [
-                    self.countries.get(cc, {}).get('name', cc) 
-                    for cc in channel_info['countries']
-                ]
-                results.append(result)
+        for channel_id, score in self._get_search_index().search(query, limit):
+            result = self._channel_record(str(channel_id))
+            # Add country names
+            result['country_names'] = [
+                self.countries.get(cc, {}).get('name', cc) 
+                for cc in result['countries']
+            ]
+            result['score'] = score
+            results.append(result)
         
         return results
     
+    def _get_search_index(self):
+        """Name index, built on first search and rebuilt when channels were added since"""
+        channels = self.channels_db['channels']
+        if self._search_index is None or len(self._search_index) != len(channels):
+            self._search_index = ChannelSearchIndex.from_channels(channels)
+        return self._search_index
+    
     def _print_stats(self):
         """Print database statistics"""
         stats = self.channels_db['metadata']['stats']
@@ -256,7 +380,7 @@ class ChannelDatabase:
         print("📊 CHANNEL DATABASE STATISTICS")
         print("="*60)
         print(f"🎯 Total unique channels: {self.channels_db['metadata']['total_channels']}")
-        print(f"🌍 Countries with channels: {len(self.channels_db['country_channels'])}")
+        print(f"🌍 Countries with channels: {len(self.country_index)}")
         print(f"⚽ Matches processed: {stats['matches_processed']}")
         print(f"📡 New channels discovered: {stats['channels_discovered']}")
         print(f"💾 API requests saved: {stats['api_requests_saved']}")
@@ -264,7 +388,7 @@ class ChannelDatabase:
             print(f"📈 Cache hit rate: {stats['cache_hit_rate']:.1f}%")
         
         # Top countries by channel count
-        country_counts = [(country, len(channels)) for country, channels in self.channels_db['country_channels'].items()]
+        country_counts = [(country, len(channels)) for country, channels in self.country_index.items()]
         country_counts.sort(key=lambda x: x[1], reverse=True)
         
         print(f"\n🏆 Top countries by channel count:")
@@ -275,19 +399,31 @@ class ChannelDatabase:
 
 async def main():
     db = ChannelDatabase()
-    
+    try:
+        await run_command(db)
+    finally:
+        await db.close()
+        await shared_sessions.close()
+
+
+async def run_command(db):
     if len(sys.argv) > 1:
         command = sys.argv[1].lower()
         
         if command == 'build':
             # Build database from live events
             limit = int(sys.argv[2]) if len(sys.argv) > 2 else 30
-            await db.process_live_events(limit)
+            concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_CONCURRENCY
+            await db.process_live_events(limit, concurrency)
             
         elif command == 'stats':
             # Show database statistics
             db._print_stats()
             
+        elif command == 'compact':
+            # Fold the journal back into the JSON file
+            db._save_database(compact=True)
+            
         elif command == 'country' and len(sys.argv) > 2:
             # Show channels for specific country
             country_code = sys.argv[2].upper()
@@ -332,8 +468,9 @@ def print_help():
     print("📺 TV Channel Database Manager")
     print("=" * 40)
     print("Commands:")
-    print("  build [limit]       # Build database from live events (default: 30)")
+    print("  build [limit] [n]   # Build database from live events (default: 30, n parallel requests: 8)")
     print("  stats               # Show database statistics")
+    print("  compact             # Rewrite the JSON file with all journaled changes")
     print("  country <code>      # Show channels for country (e.g., US, BR, PT)")
     print("  search <query>      # Search channels by name")
     print("")
@@ -0,0 +1,115 @@
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+DEFAULT_CACHE_FILENAME = "match_channels_cache.sqlite"
+DEFAULT_TTL = 300.0
+# Expired rows are deleted after this many writes, and when a writer closes the cache
+DEFAULT_PURGE_EVERY = 500
+# Seconds a match_channels payload stays fresh, keyed by SofaScore status type.
+# Broadcasters are settled once a match kicks off; pre-match listings still move.
+STATUS_TTLS = {
+    "notstarted": 300.0,
+    "inprogress": 3600.0,
+    "finished": 86400.0,
+    "postponed": 600.0,
+    "canceled": 86400.0,
+}
+
+
+class MatchChannelsCache:
+    """On-disk TTL cache of ``match_channels()`` payloads keyed by event id.
+
+    Expired rows are purged every ``purge_every`` writes and when a process that
+    wrote to the cache closes it, so a run every minute doesn't grow the file forever.
+    """
+
+    def __init__(self, path: Path, ttls: Optional[Dict[str, float]] = None, purge_every: int = DEFAULT_PURGE_EVERY):
+        self.path = Path(path)
+        self.ttls = dict(STATUS_TTLS, **(ttls or {}))
+        self.purge_every = max(1, int(purge_every))
+        self._conn: Optional[sqlite3.Connection] = None
+        self._puts_since_purge = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path))
+            # WAL lets overlapping cron runs read while another one writes
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS match_channels ("
+                " event_id INTEGER PRIMARY KEY,"
+                " status TEXT,"
+                " payload TEXT NOT NULL,"
+                " fetched_at REAL NOT NULL,"
+                " expires_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS match_channels_expiry ON match_channels (expires_at)"
+            )
+        return self._conn
+
+    def ttl_for(self, status_type: Optional[str]) -> float:
+        return self.ttls.get(status_type or "", DEFAULT_TTL)
+
+    def get(self, event_id: int, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        now = time.time() if now is None else now
+        row = self._connect().execute(
+            "SELECT payload FROM match_channels WHERE event_id = ? AND expires_at > ?",
+            (int(event_id), now),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(
+        self,
+        event_id: int,
+        payload: Dict[str, Any],
+        status_type: Optional[str] = None,
+        now: Optional[float] = None,
+    ) -> None:
+        now = time.time() if now is None else now
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO match_channels VALUES (?, ?, ?, ?, ?)",
+                (
+                    int(event_id),
+                    status_type,
+                    json.dumps(payload, separators=(",", ":")),
+                    now,
+                    now + self.ttl_for(status_type),
+                ),
+            )
+        self._puts_since_purge += 1
+        if self._puts_since_purge >= self.purge_every:
+            self.purge_expired(now)
+
+    def invalidate(self, event_ids: Optional[Iterable[int]] = None) -> int:
+        """Drop cached payloads for ``event_ids``, or everything when omitted."""
+        with self._connect() as conn:
+            if event_ids is None:
+                return conn.execute("DELETE FROM match_channels").rowcount
+            return conn.executemany(
+                "DELETE FROM match_channels WHERE event_id = ?",
+                [(int(event_id),) for event_id in event_ids],
+            ).rowcount
+
+    def purge_expired(self, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        self._puts_since_purge = 0
+        with self._connect() as conn:
+            return conn.execute(
+                "DELETE FROM match_channels WHERE expires_at <= ?", (now,)
+            ).rowcount
+
+    def close(self) -> None:
+        if self._conn is not None:
+            if self._puts_since_purge:
+                try:
+                    self.purge_expired()
+                except sqlite3.Error:
+                    pass  # another process holds the write lock; whoever writes next purges
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,223 @@
+import bisect
+import heapq
+import re
+import unicodedata
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+DEFAULT_SEARCH_LIMIT = 20
+# Per-token match scores; a channel's score is the sum over the query's tokens
+EXACT_SCORE = 4.0
+PREFIX_SCORE = 3.0
+SUBSTRING_SCORE = 2.0
+FUZZY_SCORE = 1.5
+# Whole-name bonuses on top of the token scores
+FULL_NAME_BONUS = 4.0
+NAME_PREFIX_BONUS = 2.0
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and punctuation: ``"Sky Sport Uno HD"`` -> ``"sky sport uno hd"``."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    ascii_text = "".join(char for char in decomposed if not unicodedata.combining(char)).lower()
+    return _NON_ALNUM.sub(" ", ascii_text).strip()
+
+
+def trigrams(token: str) -> Set[str]:
+    """Trigrams of a token padded at both ends, so prefixes and short tokens still share some."""
+    padded = f"  {token} "
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+def edit_distance(left: str, right: str, limit: int) -> int:
+    """Levenshtein distance with adjacent transpositions, giving up (``limit + 1``) past ``limit``."""
+    if abs(len(left) - len(right)) > limit:
+        return limit + 1
+    previous_previous: List[int] = []
+    previous = list(range(len(right) + 1))
+    for i, left_char in enumerate(left, 1):
+        current = [i] + [0] * len(right)
+        for j, right_char in enumerate(right, 1):
+            cost = 0 if left_char == right_char else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and left_char == right[j - 2] and left[i - 2] == right_char:
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        # A transposition reaches back two rows, so stop only once both are past the limit
+        if min(current) > limit and min(previous) > limit:
+            return limit + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+def max_edits(token: str) -> int:
+    """Typos tolerated for a query token: none for 1-3 letters, one up to 6, then two."""
+    if len(token) <= 3:
+        return 0
+    return 1 if len(token) <= 6 else 2
+
+
+class ChannelSearchIndex:
+    """Token and trigram index over channel names for ranked, typo-tolerant search.
+
+    Names are split into normalized tokens. Each query token is matched against
+    the token vocabulary exactly, by prefix (binary search over the sorted
+    vocabulary), by substring and within a small edit distance (both via a
+    trigram index over the vocabulary, not over every channel). A channel must
+    match every query token; exact matches outrank prefixes, which outrank
+    substrings and typos.
+    """
+
+    def __init__(self) -> None:
+        self.names: Dict[int, str] = {}
+        self._normalized: Dict[int, str] = {}
+        self._order: Dict[int, Tuple[int, str]] = {}  # ties: shorter, then alphabetical names first
+        self._postings: Dict[str, Set[int]] = {}
+        self._vocabulary: Optional[List[str]] = None  # sorted tokens, rebuilt after changes
+        self._trigram_tokens: Dict[str, Set[str]] = {}
+
+    @classmethod
+    def from_channels(cls, channels: Dict[Any, Dict[str, Any]]) -> "ChannelSearchIndex":
+        """Build from a database's ``channels`` table (``id -> {"name": ...}``)."""
+        index = cls()
+        for channel_id, channel in channels.items():
+            index.add(int(channel_id), str(channel.get("name", "")))
+        return index
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def add(self, channel_id: int, name: str) -> None:
+        if channel_id in self.names:
+            self.remove(channel_id)
+        self.names[channel_id] = name
+        self._order[channel_id] = (len(name), name)
+        normalized = normalize(name)
+        self._normalized[channel_id] = normalized
+        for token in set(normalized.split()):
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = set()
+                self._vocabulary = None
+                for trigram in trigrams(token):
+                    self._trigram_tokens.setdefault(trigram, set()).add(token)
+            postings.add(channel_id)
+
+    def remove(self, channel_id: int) -> None:
+        normalized = self._normalized.pop(channel_id, None)
+        self.names.pop(channel_id, None)
+        self._order.pop(channel_id, None)
+        if normalized is None:
+            return
+        for token in set(normalized.split()):
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.discard(channel_id)
+            if not postings:
+                del self._postings[token]
+                self._vocabulary = None
+                for trigram in trigrams(token):
+                    self._trigram_tokens[trigram].discard(token)
+
+    def search(self, query: str, limit: Optional[int] = DEFAULT_SEARCH_LIMIT) -> List[Tuple[int, float]]:
+        """``(channel_id, score)`` pairs, best first; ties go to the shorter name."""
+        normalized_query = normalize(query)
+        query_tokens = normalized_query.split()
+        if not query_tokens:
+            return []
+
+        scores: Optional[Dict[int, float]] = None
+        for query_token in query_tokens:
+            token_scores = self._match_token(query_token)
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {
+                    channel_id: score + token_scores[channel_id]
+                    for channel_id, score in scores.items()
+                    if channel_id in token_scores
+                }
+            if not scores:
+                return []
+
+        assert scores is not None
+        # Scores take a handful of distinct values: bucket by score, then only the
+        # buckets that reach the limit need ordering by name
+        by_score: Dict[float, List[int]] = {}
+        for channel_id, score in scores.items():
+            normalized = self._normalized[channel_id]
+            if normalized == normalized_query:
+                score += FULL_NAME_BONUS
+            elif normalized.startswith(normalized_query):
+                score += NAME_PREFIX_BONUS
+            by_score.setdefault(score, []).append(channel_id)
+
+        ranked: List[Tuple[int, float]] = []
+        order = self._order.__getitem__
+        for score in sorted(by_score, reverse=True):
+            channel_ids = by_score[score]
+            if limit:
+                channel_ids = heapq.nsmallest(limit - len(ranked), channel_ids, key=order)
+            else:
+                channel_ids.sort(key=order)
+            ranked.extend((channel_id, score) for channel_id in channel_ids)
+            if limit and len(ranked) >= limit:
+                break
+        return ranked
+
+    def _match_token(self, query_token: str) -> Dict[int, float]:
+        """Best score per channel for one query token."""
+        token_scores: Dict[str, float] = {}
+        if query_token in self._postings:
+            token_scores[query_token] = EXACT_SCORE
+
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        vocabulary = self._vocabulary
+        for position in range(bisect.bisect_left(vocabulary, query_token), len(vocabulary)):
+            if not vocabulary[position].startswith(query_token):
+                break
+            token_scores.setdefault(vocabulary[position], PREFIX_SCORE)
+
+        if len(query_token) >= 3:
+            for token in self._tokens_containing(query_token):
+                token_scores.setdefault(token, SUBSTRING_SCORE)
+            # Numbers ("Sport TV 2") are matched literally; a typo there is a different channel
+            edits = 0 if query_token.isdigit() else max_edits(query_token)
+            if edits:
+                for token in self._similar_tokens(query_token):
+                    if token in token_scores:
+                        continue
+                    distance = edit_distance(query_token, token, edits)
+                    if distance <= edits:
+                        token_scores[token] = FUZZY_SCORE / distance
+
+        channel_scores: Dict[int, float] = {}
+        for token, score in token_scores.items():
+            for channel_id in self._postings[token]:
+                if score > channel_scores.get(channel_id, 0.0):
+                    channel_scores[channel_id] = score
+        return channel_scores
+
+    def _tokens_containing(self, query_token: str) -> Iterable[str]:
+        # Every trigram inside the query must appear in a token that contains it
+        inner = {query_token[index:index + 3] for index in range(len(query_token) - 2)}
+        postings = sorted((self._trigram_tokens.get(trigram, set()) for trigram in inner), key=len)
+        candidates = postings[0].intersection(*postings[1:])
+        return [token for token in candidates if query_token in token]
+
+    def _similar_tokens(self, query_token: str) -> Iterable[str]:
+        # One edit changes at most four padded trigrams (a transposition), so a token
+        # within `edits` edits still shares all but 4 * edits of the query's trigrams
+        edits = max_edits(query_token)
+        query_trigrams = trigrams(query_token)
+        needed = max(1, len(query_trigrams) - 4 * edits)
+        shared: Counter = Counter()
+        for trigram in query_trigrams:
+            shared.update(self._trigram_tokens.get(trigram, ()))
+        return [
+            token for token, count in shared.items()
+            if count >= needed and abs(len(token) - len(query_token)) <= edits
+        ]
@@ -0,0 +1,75 @@
+import hashlib
+import marshal
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .atomic_file import PathLike, atomic_write
+
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_SUFFIX = ".snapshot"
+
+
+def snapshot_path_for(json_path: PathLike) -> Path:
+    return Path(json_path).with_suffix(SNAPSHOT_SUFFIX)
+
+
+def file_sha256(path: PathLike) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_stamp(json_path: PathLike) -> Tuple[int, int, str]:
+    """``(size, mtime_ns, sha256)`` of a source file, stamped into the copies derived from it."""
+    stat = os.stat(json_path)
+    return stat.st_size, stat.st_mtime_ns, file_sha256(json_path)
+
+
+def stamp_matches(json_path: PathLike, size: int, mtime_ns: int, digest: str) -> bool:
+    """Whether ``json_path`` is still the file a copy was stamped with."""
+    try:
+        stat = os.stat(json_path)
+    except OSError:
+        return False
+    if stat.st_size != size:
+        return False
+    # Unchanged size+mtime means unchanged file; otherwise (checkout, copy) verify content
+    return stat.st_mtime_ns == mtime_ns or file_sha256(json_path) == digest
+
+
+def write_snapshot(
+    json_path: PathLike, db: Dict[str, Any], snapshot_path: Optional[PathLike] = None
+) -> Path:
+    """Write a marshal snapshot of ``db`` stamped with the source JSON's fingerprint.
+
+    ``db`` must be the exact content of ``json_path``; the stamp is what lets
+    readers detect a snapshot that no longer matches its JSON.
+    """
+    target = Path(snapshot_path) if snapshot_path else snapshot_path_for(json_path)
+    header = (SNAPSHOT_FORMAT, tuple(sys.version_info[:2])) + source_stamp(json_path)
+    with atomic_write(target, "wb") as handle:
+        handle.write(marshal.dumps((header, db)))
+    return target
+
+
+def load_snapshot(
+    json_path: PathLike, snapshot_path: Optional[PathLike] = None
+) -> Optional[Dict[str, Any]]:
+    """Return the snapshotted database if it still matches ``json_path``, else ``None``."""
+    source = Path(snapshot_path) if snapshot_path else snapshot_path_for(json_path)
+    try:
+        header, db = marshal.loads(source.read_bytes())
+        fmt, python_version, size, mtime_ns, digest = header
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    # marshal output is only guaranteed to round-trip on the same Python version
+    if fmt != SNAPSHOT_FORMAT or tuple(python_version) != tuple(sys.version_info[:2]):
+        return None
+    if not stamp_matches(json_path, size, mtime_ns, digest):
+        return None
+    return db
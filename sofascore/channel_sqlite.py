@@ -0,0 +1,224 @@
+import json
+import os
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .atomic_file import PathLike, temp_path_for
+from .channel_search import DEFAULT_SEARCH_LIMIT, normalize
+from .channel_snapshot import source_stamp, stamp_matches
+from .channel_table import CountryRecord
+
+SQLITE_SUFFIX = ".sqlite"
+
+SCHEMA = (
+    # Stamp of the JSON file the database was built from, to detect a stale copy
+    "CREATE TABLE source (size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, sha256 TEXT NOT NULL)",
+    "CREATE TABLE metadata (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    "CREATE TABLE countries ("
+    " code TEXT PRIMARY KEY,"
+    " name TEXT NOT NULL,"
+    " continent TEXT NOT NULL,"
+    " is_eu INTEGER NOT NULL)",
+    # `record` is the channel's full JSON record (logo, website, ...)
+    "CREATE TABLE channels (id INTEGER PRIMARY KEY, name TEXT NOT NULL, record TEXT NOT NULL)",
+    "CREATE TABLE channel_countries ("
+    " channel_id INTEGER NOT NULL,"
+    " country_code TEXT NOT NULL,"
+    " PRIMARY KEY (channel_id, country_code)) WITHOUT ROWID",
+    "CREATE INDEX channel_countries_by_country ON channel_countries (country_code, channel_id)",
+    # External-content index: the names live once, in `channels`
+    "CREATE VIRTUAL TABLE channel_names USING fts5("
+    " name, content='channels', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+)
+
+
+def sqlite_path_for(json_path: PathLike) -> Path:
+    return Path(json_path).with_suffix(SQLITE_SUFFIX)
+
+
+def write_channels_sqlite(db: Dict[str, Any], path: PathLike, json_path: PathLike) -> Path:
+    """Write the unified database (``metadata``, ``countries``, ``channels``) as SQLite.
+
+    ``db`` must be the exact content of ``json_path``, whose stamp is stored so
+    readers can tell when the copy no longer matches the JSON. The file is built
+    next to its destination and renamed into place, so processes reading the
+    old one keep a consistent view until they reopen.
+    """
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = temp_path_for(target)
+    tmp_path.unlink(missing_ok=True)
+    conn = sqlite3.connect(str(tmp_path))
+    try:
+        with conn:
+            for statement in SCHEMA:
+                conn.execute(statement)
+            conn.execute("INSERT INTO source VALUES (?, ?, ?)", source_stamp(json_path))
+            conn.executemany(
+                "INSERT INTO metadata VALUES (?, ?)",
+                ((key, json.dumps(value, ensure_ascii=False)) for key, value in db.get("metadata", {}).items()),
+            )
+            conn.executemany(
+                "INSERT INTO countries VALUES (?, ?, ?, ?)",
+                (
+                    (code, info.get("name", code), info.get("continent", "Unknown"), int(bool(info.get("is_eu"))))
+                    for code, info in db.get("countries", {}).items()
+                ),
+            )
+            channels = db.get("channels", {})
+            conn.executemany(
+                "INSERT OR REPLACE INTO channels VALUES (?, ?, ?)",
+                (
+                    (int(channel_id), str(channel.get("name", f"Channel {channel_id}")),
+                     json.dumps(channel, ensure_ascii=False, separators=(",", ":")))
+                    for channel_id, channel in channels.items()
+                ),
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO channel_countries VALUES (?, ?)",
+                (
+                    (int(channel_id), country_code)
+                    for channel_id, channel in channels.items()
+                    for country_code in channel.get("countries", ())
+                ),
+            )
+            conn.execute("INSERT INTO channel_names (channel_names) VALUES ('rebuild')")
+        conn.execute("VACUUM")
+    except BaseException:
+        conn.close()
+        tmp_path.unlink(missing_ok=True)
+        raise
+    conn.close()
+    os.replace(tmp_path, target)
+    return target
+
+
+class SqliteChannelTable:
+    """``ChannelTable`` look-alike that answers from the SQLite database instead of memory.
+
+    Opening it reads only the metadata and the countries table; channel names
+    and records are point queries on the primary key, memoized per process.
+    Channels added after the build (the change log) are kept in memory, as in
+    ``ChannelTable``. Per-country listings and name search run on the
+    ``channel_countries`` index and the FTS5 ``channel_names`` table.
+    """
+
+    def __init__(self, path: PathLike):
+        self.source_path = Path(path)
+        # Read-only: a missing file raises instead of creating an empty database
+        self._conn = sqlite3.connect(f"{self.source_path.resolve().as_uri()}?mode=ro", uri=True)
+        self.countries = {
+            code: CountryRecord(sys.intern(code), sys.intern(name), sys.intern(continent), bool(is_eu))
+            for code, name, continent, is_eu in self._conn.execute(
+                "SELECT code, name, continent, is_eu FROM countries"
+            )
+        }
+        self.metadata: Dict[str, Any] = {}
+        for key, value in self._conn.execute("SELECT key, value FROM metadata"):
+            value = json.loads(value)
+            if not isinstance(value, (dict, list)):
+                self.metadata[key] = value
+        self._count: Optional[int] = None
+        self._names: Dict[int, Optional[str]] = {}
+        self._added: Dict[int, Dict[str, Any]] = {}
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def matches_source(self, json_path: PathLike) -> bool:
+        """Whether the database was built from ``json_path`` as it is now."""
+        try:
+            row = self._conn.execute("SELECT size, mtime_ns, sha256 FROM source").fetchone()
+        except sqlite3.Error:
+            return False
+        return row is not None and stamp_matches(json_path, *row)
+
+    def __len__(self) -> int:
+        if self._count is None:
+            self._count = self._conn.execute("SELECT COUNT(*) FROM channels").fetchone()[0]
+        return self._count + len(self._added)
+
+    def __contains__(self, channel_id: Union[int, str]) -> bool:
+        return self.name(channel_id) is not None
+
+    def channel_ids(self) -> Iterator[int]:
+        for (channel_id,) in self._conn.execute("SELECT id FROM channels"):
+            yield channel_id
+        yield from self._added
+
+    def name(self, channel_id: Union[int, str]) -> Optional[str]:
+        try:
+            channel_id = int(channel_id)
+        except (TypeError, ValueError):
+            return None
+        try:
+            return self._names[channel_id]
+        except KeyError:
+            pass
+        row = self._conn.execute("SELECT name FROM channels WHERE id = ?", (channel_id,)).fetchone()
+        # Misses are remembered too: unknown ids come up again on every board
+        name = self._names[channel_id] = sys.intern(row[0]) if row else None
+        return name
+
+    def country(self, code: str) -> Optional[CountryRecord]:
+        return self.countries.get(code)
+
+    def add(self, record: Dict[str, Any]) -> bool:
+        """Add a channel discovered after the database was built; existing ids win."""
+        channel_id = int(record["id"])
+        if self.name(channel_id) is not None:
+            return False
+        self._names[channel_id] = sys.intern(str(record["name"]))
+        self._added[channel_id] = record
+        return True
+
+    def added(self) -> Iterable[Dict[str, Any]]:
+        return self._added.values()
+
+    def record(self, channel_id: Union[int, str]) -> Optional[Dict[str, Any]]:
+        """Full channel record (logo, website, countries, ...)."""
+        channel_id = int(channel_id)
+        if channel_id in self._added:
+            return dict(self._added[channel_id])
+        row = self._conn.execute("SELECT record FROM channels WHERE id = ?", (channel_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def release_records(self) -> None:
+        """Drop memoized names; records are never held in memory."""
+        self._names = {channel_id: record["name"] for channel_id, record in self._added.items()}
+
+    def channel_ids_for_country(self, code: str) -> List[int]:
+        """Ids of the channels listed for a country, ascending."""
+        code = code.upper()
+        channel_ids = [
+            channel_id
+            for (channel_id,) in self._conn.execute(
+                "SELECT channel_id FROM channel_countries WHERE country_code = ? ORDER BY channel_id", (code,)
+            )
+        ]
+        added = [channel_id for channel_id, record in self._added.items() if code in record.get("countries", ())]
+        return sorted(channel_ids + added) if added else channel_ids
+
+    def search(self, query: str, limit: Optional[int] = DEFAULT_SEARCH_LIMIT) -> List[Tuple[int, str]]:
+        """``(channel_id, name)`` for names containing every query word as a word prefix, best first."""
+        tokens = normalize(query).split()
+        if not tokens:
+            return []
+        # Quoted prefix terms, so user input is never parsed as FTS5 syntax
+        match = " ".join(f'"{token}"*' for token in tokens)
+        rows = self._conn.execute(
+            "SELECT channels.id, channels.name FROM channel_names"
+            " JOIN channels ON channels.id = channel_names.rowid"
+            " WHERE channel_names MATCH ?"
+            " ORDER BY bm25(channel_names), length(channels.name), channels.name"
+            " LIMIT ?",
+            (match, limit or -1),
+        )
+        results = [(channel_id, name) for channel_id, name in rows]
+        for channel_id, record in self._added.items():
+            words = normalize(str(record["name"])).split()
+            if all(any(word.startswith(token) for word in words) for token in tokens):
+                results.append((channel_id, record["name"]))
+        return results[:limit] if limit else results
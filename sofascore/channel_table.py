@@ -0,0 +1,154 @@
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .atomic_file import PathLike
+from .channel_search import DEFAULT_SEARCH_LIMIT, ChannelSearchIndex
+from .channel_snapshot import load_snapshot
+
+
+class CountryRecord:
+    """Country details the coverage blocks need, without a per-country dict."""
+
+    __slots__ = ("code", "name", "continent", "is_eu")
+
+    def __init__(self, code: str, name: str, continent: str, is_eu: bool):
+        self.code = code
+        self.name = name
+        self.continent = continent
+        self.is_eu = is_eu
+
+    @classmethod
+    def unknown(cls, code: str) -> "CountryRecord":
+        return cls(code, code, "Unknown", False)
+
+
+class ChannelTable:
+    """Compact, read-mostly view of channels_database.json for the mapper's hot path.
+
+    Keeps only ``int channel id -> interned name`` and one slotted record per
+    country. Logos, websites, descriptions and the rest of each channel record
+    stay on disk and are loaded by ``record()`` the first time one is asked for.
+    """
+
+    def __init__(
+        self,
+        names: Dict[int, str],
+        countries: Dict[str, CountryRecord],
+        metadata: Optional[Dict[str, Any]] = None,
+        source_path: Optional[PathLike] = None,
+    ):
+        self.names = names
+        self.countries = countries
+        self.metadata = metadata or {}
+        self.source_path = Path(source_path) if source_path else None
+        self._added: Dict[int, Dict[str, Any]] = {}
+        self._records: Optional[Dict[str, Any]] = None
+        self._country_ids: Optional[Dict[str, List[int]]] = None  # built on first listing
+        self._search_index: Optional[ChannelSearchIndex] = None
+
+    @classmethod
+    def from_database(cls, db: Dict[str, Any], source_path: Optional[PathLike] = None) -> "ChannelTable":
+        intern = sys.intern
+        names = {
+            int(channel_id): intern(str(channel.get("name", f"Channel {channel_id}")))
+            for channel_id, channel in db.get("channels", {}).items()
+        }
+        countries = {
+            code: CountryRecord(
+                intern(code),
+                intern(info.get("name", code)),
+                intern(info.get("continent", "Unknown")),
+                bool(info.get("is_eu", False)),
+            )
+            for code, info in db.get("countries", {}).items()
+        }
+        metadata = {key: value for key, value in db.get("metadata", {}).items() if not isinstance(value, (dict, list))}
+        return cls(names, countries, metadata, source_path)
+
+    @classmethod
+    def empty(cls, source_path: Optional[PathLike] = None) -> "ChannelTable":
+        return cls({}, {}, None, source_path)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, channel_id: Union[int, str]) -> bool:
+        return int(channel_id) in self.names
+
+    def channel_ids(self) -> Iterator[int]:
+        return iter(self.names)
+
+    def name(self, channel_id: Union[int, str]) -> Optional[str]:
+        name = self.names.get(channel_id)  # type: ignore[arg-type]
+        if name is None and isinstance(channel_id, str) and channel_id.isdigit():
+            name = self.names.get(int(channel_id))
+        return name
+
+    def country(self, code: str) -> Optional[CountryRecord]:
+        return self.countries.get(code)
+
+    def add(self, record: Dict[str, Any]) -> bool:
+        """Add a channel discovered after the database was built; existing ids win."""
+        channel_id = int(record["id"])
+        if channel_id in self.names:
+            return False
+        self.names[channel_id] = sys.intern(str(record["name"]))
+        self._added[channel_id] = record
+        return True
+
+    def added(self) -> Iterable[Dict[str, Any]]:
+        return self._added.values()
+
+    def record(self, channel_id: Union[int, str]) -> Optional[Dict[str, Any]]:
+        """Full channel record (logo, website, countries, ...), read from disk on first use."""
+        channel_id = int(channel_id)
+        if channel_id in self._added:
+            return dict(self._added[channel_id])
+        if self._records is None:
+            self._records = self._load_records()
+        record = self._records.get(str(channel_id))
+        return dict(record) if record is not None else None
+
+    def release_records(self) -> None:
+        """Drop full records loaded by ``record()``; they are re-read on the next call."""
+        self._records = None
+
+    def channel_ids_for_country(self, code: str) -> List[int]:
+        """Ids of the channels listed for a country, ascending.
+
+        The per-country index is built from the records on first use; the
+        records themselves are not kept.
+        """
+        if self._country_ids is None:
+            records = self._records if self._records is not None else self._load_records()
+            country_ids: Dict[str, List[int]] = {}
+            for channel_id, channel in records.items():
+                for country_code in channel.get("countries", ()):
+                    country_ids.setdefault(country_code, []).append(int(channel_id))
+            self._country_ids = {country_code: sorted(ids) for country_code, ids in country_ids.items()}
+        code = code.upper()
+        channel_ids = self._country_ids.get(code, [])
+        added = [channel_id for channel_id, record in self._added.items() if code in record.get("countries", ())]
+        return sorted(channel_ids + added) if added else list(channel_ids)
+
+    def search(self, query: str, limit: Optional[int] = DEFAULT_SEARCH_LIMIT) -> List[Tuple[int, str]]:
+        """``(channel_id, name)`` for names matching every query word, best first."""
+        if self._search_index is None or len(self._search_index) != len(self.names):
+            self._search_index = ChannelSearchIndex()
+            for channel_id, name in self.names.items():
+                self._search_index.add(channel_id, name)
+        return [(channel_id, self.names[channel_id]) for channel_id, _ in self._search_index.search(query, limit)]
+
+    def _load_records(self) -> Dict[str, Any]:
+        if self.source_path is None:
+            return {}
+        db = load_snapshot(self.source_path)
+        if db is None:
+            try:
+                with open(self.source_path, "r", encoding="utf-8") as handle:
+                    db = json.load(handle)
+            except (OSError, ValueError):
+                return {}
+        return db.get("channels", {})
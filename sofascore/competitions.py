@@ -1,18 +1,53 @@
 import argparse
 import asyncio
 import json
+import sys
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set, Union
 
-from sofascore_wrapper.api import SofascoreAPI
 from sofascore_wrapper.league import League
 
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+    from sofascore.channel_snapshot import load_snapshot, write_snapshot
+    from sofascore.session import shared_sessions
+else:
+    from .channel_snapshot import load_snapshot, write_snapshot
+    from .session import shared_sessions
+
 DEFAULT_SPORT = "football"
+SPORTS_SUFFIX = ".sports.snapshot"
+
+
+def sport_slugs_path_for(json_path: Union[str, Path]) -> Path:
+    path = Path(json_path)
+    return path.with_name(path.stem + SPORTS_SUFFIX)
+
+
+def write_sport_slugs(json_path: Union[str, Path], data: List[Dict[str, object]]) -> Set[str]:
+    """Save the dump's sport slugs next to it, stamped like the channel snapshot."""
+    slugs = {str(competition.get("sportSlug", DEFAULT_SPORT)) for competition in data}
+    write_snapshot(json_path, {"sport_slugs": sorted(slugs)}, sport_slugs_path_for(json_path))
+    return slugs
+
+
+def load_sport_slugs(json_path: Union[str, Path]) -> Optional[Set[str]]:
+    """Sport slugs of a competitions dump without parsing it, or None when the sidecar is stale."""
+    snapshot = load_snapshot(json_path, sport_slugs_path_for(json_path))
+    if snapshot is None:
+        return None
+    return set(snapshot.get("sport_slugs", ()))
 
 
-async def fetch_competitions(sport_slug: str) -> List[Dict[str, object]]:
-    """Fetch every competition (unique tournament) for a given SofaScore sport."""
-    api = SofascoreAPI()
+async def fetch_competitions(sport_slug: str, api: Any = None) -> List[Dict[str, object]]:
+    """Fetch every competition (unique tournament) for a given SofaScore sport.
+
+    Uses ``api`` when given, otherwise borrows the process-wide shared session.
+    """
+    if api is None:
+        async with shared_sessions.session() as shared_api:
+            return await fetch_competitions(sport_slug, shared_api)
+
     league_client = League(api, 0)
     competitions: List[Dict[str, object]] = []
 
@@ -49,8 +84,6 @@ async def fetch_competitions(sport_slug: str) -> List[Dict[str, object]]:
                     )
     except Exception as exc:  # noqa: BLE001
         print(f"⚠️ Failed to fetch competitions for {sport_slug}: {exc}")
-    finally:
-        await api.close()
 
     return competitions
 
@@ -62,15 +95,24 @@ async def fetch_soccer_competitions() -> List[Dict[str, object]]:
 
 async def fetch_competitions_for_sports(sports: Iterable[str]) -> List[Dict[str, object]]:
     competitions: List[Dict[str, object]] = []
-    for sport in sports:
-        competitions.extend(await fetch_competitions(sport))
+    async with shared_sessions.session() as api:
+        for sport in sports:
+            competitions.extend(await fetch_competitions(sport, api))
     return competitions
 
 
+async def _fetch_and_close(sports: Iterable[str]) -> List[Dict[str, object]]:
+    try:
+        return await fetch_competitions_for_sports(sports)
+    finally:
+        await shared_sessions.close()
+
+
 def _serialize(data: List[Dict[str, object]], output_path: Optional[Path], indent: int) -> None:
     serialized = json.dumps(data, indent=indent)
     if output_path:
         output_path.write_text(serialized, encoding="utf-8")
+        write_sport_slugs(output_path, data)
     else:
         print(serialized)
 
@@ -103,7 +145,7 @@ def parse_args() -> argparse.Namespace:
 def main() -> None:
     args = parse_args()
     sports = args.sports or [DEFAULT_SPORT]
-    data = asyncio.run(fetch_competitions_for_sports(sports))
+    data = asyncio.run(_fetch_and_close(sports))
     _serialize(data, args.out, args.indent)
 
 
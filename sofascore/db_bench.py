@@ -0,0 +1,323 @@
+import argparse
+import gc
+import io
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from sofascore.channel_search import ChannelSearchIndex
+from sofascore.channel_snapshot import snapshot_path_for
+from sofascore.channel_sqlite import SqliteChannelTable, sqlite_path_for, write_channels_sqlite
+from sofascore.live_events import CachedTVMapper
+from sofascore.output_formats import FORMAT_COMPACT, format_events
+
+DEFAULT_SIZES = (3_600, 36_000, 360_000)
+DEFAULT_COUNTRIES_FILE = Path("data/geolite2_countries.json")
+DEFAULT_LOOKUPS = 200_000
+DEFAULT_EVENTS = 1_000
+DEFAULT_MISS_RATE = 0.05
+DEFAULT_SEARCHES = 200
+DEFAULT_SEED = 1234
+
+
+def load_countries(countries_path: Path) -> Dict[str, Dict[str, Any]]:
+    """ISO2 -> {name, continent, is_eu}, exactly as SportAPIChannelFetcher builds it."""
+    countries: Dict[str, Dict[str, Any]] = {}
+    for country in json.loads(countries_path.read_text(encoding="utf-8")):
+        iso_code = country.get("country_iso_code", "").upper().strip()
+        if iso_code and len(iso_code) == 2:
+            countries[iso_code] = {
+                "name": country.get("country_name", iso_code),
+                "continent": country.get("continent_name", "Unknown"),
+                "is_eu": bool(country.get("is_in_european_union", 0)),
+            }
+    return countries
+
+
+def generate_channels_database(
+    channel_count: int, countries: Dict[str, Dict[str, Any]], seed: int = DEFAULT_SEED
+) -> Dict[str, Any]:
+    """Synthetic database in the shape ``UnifiedDatabaseBuilder`` saves to channels_database.json."""
+    rng = random.Random(seed)
+    now = datetime.now()
+    country_codes = sorted(countries)
+    channel_ids = rng.sample(range(1, channel_count * 10), channel_count)
+
+    channels: Dict[str, Dict[str, Any]] = {}
+    for channel_id in channel_ids:
+        # Most broadcasters serve one market; a few span a region
+        channel_countries = rng.sample(country_codes, rng.choice((1, 1, 1, 1, 2, 3)))
+        primary = countries[channel_countries[0]]
+        name = f"{rng.choice(('Sport', 'TV', 'Arena', 'Premier', 'Eleven', 'Star'))} {channel_id}"
+        channels[str(channel_id)] = {
+            "id": channel_id,
+            "name": name,
+            "countries": channel_countries,
+            "continent": primary["continent"],
+            "logo": f"https://img.example.com/tv/{channel_id}.png",
+            "website": f"https://tv{channel_id}.example.com",
+            "description": f"{name} broadcasts live sport in {primary['name']}",
+            "first_discovered": (now - timedelta(days=rng.randint(0, 365))).isoformat(),
+            "is_eu_channel": primary["is_eu"],
+        }
+
+    return {
+        "metadata": {
+            "created_at": now.isoformat(),
+            "last_updated": now.isoformat(),
+            "data_source": "SportAPI (sportapi7.p.rapidapi.com)",
+            "refresh_schedule": "weekly",
+            "next_refresh": (now + timedelta(days=7)).isoformat(),
+            "total_countries": len(countries),
+            "total_channels": len(channels),
+            "api_compatibility": "SofaScore 100% compatible",
+            "stats": {
+                "countries_processed": len(countries),
+                "channels_discovered": len(channels),
+                "api_requests_made": len(countries),
+                "build_duration_minutes": 0,
+            },
+        },
+        "countries": countries,
+        "channels": channels,
+    }
+
+
+def generate_board(
+    db: Dict[str, Any], event_count: int, miss_rate: float, seed: int = DEFAULT_SEED
+) -> List[Dict[str, Any]]:
+    """``match_channels`` payloads for a live board, drawn from the database's own channels."""
+    rng = random.Random(seed)
+    by_country: Dict[str, List[int]] = {}
+    for channel in db["channels"].values():
+        for country_code in channel["countries"]:
+            by_country.setdefault(country_code, []).append(channel["id"])
+    country_codes = sorted(by_country)
+    unknown_id = max(int(channel_id) for channel_id in db["channels"]) + 1
+
+    board = []
+    for _ in range(event_count):
+        country_channels = {}
+        for country_code in rng.sample(country_codes, min(len(country_codes), rng.randint(5, 40))):
+            pool = by_country[country_code]
+            ids = rng.sample(pool, min(len(pool), rng.randint(1, 4)))
+            if rng.random() < miss_rate:
+                ids.append(unknown_id + rng.randint(0, 10_000))
+            country_channels[country_code.lower()] = ids
+        board.append({"countryChannels": country_channels})
+    return board
+
+
+def measure(fn: Callable[[], Any], repeat: int = 3) -> Tuple[float, int, Any]:
+    """Best wall time of ``repeat`` untraced runs, then peak traced memory of one more run."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    del result
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak, result
+
+
+def bench_size(
+    channel_count: int, countries: Dict[str, Dict[str, Any]], work_dir: Path, args: argparse.Namespace
+) -> Dict[str, Any]:
+    db_path = work_dir / f"channels_database_{channel_count}.json"
+    db = generate_channels_database(channel_count, countries, args.seed)
+    with open(db_path, "w", encoding="utf-8") as handle:
+        json.dump(db, handle, indent=2, ensure_ascii=False)
+    board = generate_board(db, args.events, args.miss_rate, args.seed)
+    search_results = bench_search(db, args)
+    sqlite_path = write_channels_sqlite(db, sqlite_path_for(db_path), db_path)
+    del db
+
+    mapper = CachedTVMapper(
+        channels_db_path=str(db_path), log_stream=io.StringIO(), use_match_cache=False, resolve_misses=False
+    )
+    results: Dict[str, Any] = {"channels": channel_count, "json_bytes": db_path.stat().st_size}
+    results.update(search_results)
+
+    def load_json() -> bool:
+        snapshot_path_for(db_path).unlink(missing_ok=True)
+        return mapper._load_channels_database()
+
+    results["load_json"] = measure(load_json, args.repeat)[:2]
+    results["load_snapshot"] = measure(mapper._load_channels_database, args.repeat)[:2]
+    mapper._reset_lookup_caches()
+
+    rng = random.Random(args.seed)
+    known_ids = rng.sample(list(mapper.channel_table.channel_ids()), 1000)
+    lookups = [
+        -rng.randint(1, 10_000) if rng.random() < args.miss_rate else rng.choice(known_ids)
+        for _ in range(args.lookups)
+    ]
+
+    def lookup_names() -> int:
+        for channel_id in lookups:
+            mapper._get_cached_channel_name(channel_id)
+        return len(lookups)
+
+    results["name_lookup"] = measure(lookup_names, args.repeat)[:2]
+
+    def lookup_names_sqlite() -> int:
+        # A fresh table each run, so every id is a real query rather than a memo hit
+        table = SqliteChannelTable(sqlite_path)
+        try:
+            for channel_id in lookups:
+                table.name(channel_id)
+        finally:
+            table.close()
+        return len(lookups)
+
+    results["open_sqlite"] = measure(lambda: SqliteChannelTable(sqlite_path).close(), args.repeat)[:2]
+    results["sqlite_lookup"] = measure(lookup_names_sqlite, args.repeat)[:2]
+
+    def build_coverage(cold: bool) -> Callable[[], List[Any]]:
+        def build() -> List[Any]:
+            if cold:
+                mapper._reset_lookup_caches()
+            return [mapper._process_channels_with_cache(payload) for payload in board]
+        return build
+
+    results["coverage_cold"] = measure(build_coverage(True), args.repeat)[:2]
+    results["coverage_warm"] = measure(build_coverage(False), args.repeat)[:2]
+
+    events = [
+        mapper._build_event_record(
+            {"id": index, "homeTeam": {"name": f"Home {index}"}, "awayTeam": {"name": f"Away {index}"}}, coverage
+        )
+        for index, coverage in enumerate(build_coverage(True)())
+    ]
+    results["json_full"] = measure(lambda: json.dumps(events, indent=2), args.repeat)[:2]
+    results["json_compact"] = measure(
+        lambda: json.dumps(format_events(events, FORMAT_COMPACT), separators=(",", ":")), args.repeat
+    )[:2]
+    return results
+
+
+def bench_search(db: Dict[str, Any], args: argparse.Namespace) -> Dict[str, Any]:
+    """Index build plus keystroke-style queries: growing prefixes, a typo and a multi-word query."""
+    rng = random.Random(args.seed)
+    names = [channel["name"] for channel in rng.sample(list(db["channels"].values()), args.searches)]
+    queries = []
+    for name in names:
+        first, _, rest = name.partition(" ")
+        typo = first[1] + first[0] + first[2:] if len(first) > 3 else first
+        queries.extend([first[:2], first[:4], typo, f"{first[:3]} {rest[:3]}"])
+
+    results: Dict[str, Any] = {}
+    results["search_index"] = measure(lambda: ChannelSearchIndex.from_channels(db["channels"]), args.repeat)[:2]
+    index = ChannelSearchIndex.from_channels(db["channels"])
+
+    def search_all() -> int:
+        for query in queries:
+            index.search(query)
+        return len(queries)
+
+    results["search"] = measure(search_all, args.repeat)[:2]
+    return results
+
+
+def print_report(all_results: List[Dict[str, Any]], args: argparse.Namespace) -> None:
+    rows = [
+        ("load_json", "load JSON (+snapshot write)", None),
+        ("load_snapshot", "load snapshot", None),
+        ("name_lookup", f"name lookup x{args.lookups}", args.lookups),
+        ("open_sqlite", "open SQLite database", None),
+        ("sqlite_lookup", f"SQLite name lookup x{args.lookups}", args.lookups),
+        ("coverage_cold", f"coverage, {args.events} events, cold", args.events),
+        ("coverage_warm", f"coverage, {args.events} events, memo", args.events),
+        ("json_full", "json.dumps full (indent=2)", None),
+        ("json_compact", "json.dumps compact", None),
+        ("search_index", "search index build", None),
+        ("search", f"search x{args.searches * 4} (keystrokes)", args.searches * 4),
+    ]
+    for results in all_results:
+        print(f"\n📦 {results['channels']:,} channels ({results['json_bytes'] / 1e6:.1f} MB JSON)")
+        print(f"   {'benchmark':<36} {'time':>11} {'per item':>10} {'peak mem':>10}")
+        for key, label, items in rows:
+            seconds, peak = results[key]
+            per_item = ""
+            if items:
+                nanoseconds = seconds / items * 1e9
+                per_item = f"{nanoseconds:.0f} ns" if nanoseconds < 10_000 else f"{nanoseconds / 1000:.1f} µs"
+            print(f"   {label:<36} {seconds * 1000:>8.2f} ms {per_item:>10} {peak / 1e6:>7.1f} MB")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Micro-benchmark tvmap's channel DB load, name lookups, coverage building, JSON output and search."
+    )
+    parser.add_argument(
+        "--sizes",
+        type=lambda text: [int(size) for size in text.split(",")],
+        default=list(DEFAULT_SIZES),
+        help="Comma-separated synthetic database sizes in channels (default: 3600,36000,360000).",
+    )
+    parser.add_argument(
+        "--countries",
+        type=Path,
+        default=DEFAULT_COUNTRIES_FILE,
+        help=f"GeoLite2 country list used for the countries table (default: {DEFAULT_COUNTRIES_FILE}).",
+    )
+    parser.add_argument(
+        "--lookups", type=int, default=DEFAULT_LOOKUPS, help=f"Name lookups to time (default: {DEFAULT_LOOKUPS})."
+    )
+    parser.add_argument(
+        "--events", type=int, default=DEFAULT_EVENTS, help=f"Events in the synthetic board (default: {DEFAULT_EVENTS})."
+    )
+    parser.add_argument(
+        "--miss-rate",
+        type=float,
+        default=DEFAULT_MISS_RATE,
+        help=f"Share of lookups for channels missing from the DB (default: {DEFAULT_MISS_RATE}).",
+    )
+    parser.add_argument(
+        "--searches",
+        type=int,
+        default=DEFAULT_SEARCHES,
+        help=f"Channel names to derive search queries from, 4 queries each (default: {DEFAULT_SEARCHES}).",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Untraced runs per benchmark; the best is kept (default: 3).")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="RNG seed for the synthetic data.")
+    parser.add_argument(
+        "--work-dir", type=Path, default=None, help="Keep generated databases here (default: a temp directory)."
+    )
+    parser.add_argument("--out", type=Path, default=None, help="Also save the raw results as JSON.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    countries = load_countries(args.countries)
+
+    with tempfile.TemporaryDirectory(prefix="tvmap-db-bench-") as temp_dir:
+        work_dir = args.work_dir or Path(temp_dir)
+        work_dir.mkdir(parents=True, exist_ok=True)
+        all_results = [bench_size(size, countries, work_dir, args) for size in args.sizes]
+
+    print_report(all_results, args)
+    if args.out:
+        args.out.write_text(json.dumps(all_results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
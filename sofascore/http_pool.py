@@ -0,0 +1,70 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from playwright.async_api import async_playwright
+from sofascore_wrapper.api import BASE_URL, SofascoreAPI
+
+DEFAULT_POOL_SIZE = 8
+
+
+class PooledSofascoreAPI(SofascoreAPI):
+    """SofascoreAPI that can serve overlapping ``_get`` calls.
+
+    The upstream wrapper drives a single Playwright page, so two concurrent
+    ``page.goto`` calls interrupt each other. This subclass hands every
+    in-flight request its own page from a small pool inside one browser, which
+    keeps ``Match``/``League`` helpers usable under ``asyncio.gather``.
+    All pages share one browser context, so they also share its connection
+    pool: keep-alive connections and TLS sessions are reused across requests.
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE):
+        super().__init__()
+        self.pool_size = max(1, int(pool_size))
+        self._slots = asyncio.Semaphore(self.pool_size)
+        self._init_lock = asyncio.Lock()
+        self._idle_pages: List[Any] = []
+        self.context: Optional[Any] = None
+
+    def ensure_pool_size(self, pool_size: int) -> None:
+        """Grow the pool (never shrinks) so more requests can be in flight at once."""
+        for _ in range(int(pool_size) - self.pool_size):
+            self._slots.release()
+        self.pool_size = max(self.pool_size, int(pool_size))
+
+    async def _init_browser(self):
+        async with self._init_lock:
+            if self.playwright is None:
+                self.playwright = await async_playwright().start()
+                self.browser = await self.playwright.chromium.launch(headless=True)
+                self.context = await self.browser.new_context()
+                self.page = await self.context.new_page()
+                self._idle_pages.append(self.page)
+
+    async def _fetch(self, url: str, label: str) -> Dict[str, Any]:
+        await self._init_browser()
+        async with self._slots:
+            page = self._idle_pages.pop() if self._idle_pages else await self.context.new_page()
+            try:
+                response = await page.goto(url)
+                if response.status == 200:
+                    return await response.json()
+                raise Exception(f"Failed to fetch {label}: {response.status}")
+            finally:
+                self._idle_pages.append(page)
+
+    async def _get(self, endpoint):
+        return await self._fetch(f"{BASE_URL}{endpoint}", endpoint)
+
+    async def _raw_get(self, url):
+        return await self._fetch(url, url)
+
+    async def close(self):
+        self._idle_pages.clear()
+        if self.context is not None:
+            await self.context.close()
+        await super().close()
+        self.context = None
+        self.page = None
+        self.browser = None
+        self.playwright = None
@@ -0,0 +1,258 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .atomic_file import PathLike, atomic_write
+
+CHANGES_SUFFIX = ".changes.jsonl"
+# Compact once the change log outgrows this share of the snapshot (and at least
+# the floor), so each rewrite is paid for by as many bytes of appended changes
+DEFAULT_COMPACT_RATIO = 0.5
+DEFAULT_COMPACT_MIN_BYTES = 1 << 20
+
+
+def changes_path_for(json_path: PathLike) -> Path:
+    path = Path(json_path)
+    return path.with_name(path.stem + CHANGES_SUFFIX)
+
+
+def file_stamp(path: PathLike) -> Optional[List[int]]:
+    """``[size, mtime_ns]`` of a file, or None when it doesn't exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+class JournaledStore:
+    """A JSON database saved as a snapshot plus an append-only change log.
+
+    The snapshot is the plain JSON file other tools read. Callers report what
+    they changed (``set_table``, ``set_item``, ``add_members``) and ``flush``
+    appends those changes to ``<stem>.changes.jsonl`` as one batch ending in a
+    commit line, so a save costs I/O proportional to what changed and a crash
+    mid-append loses only the unfinished batch. ``load`` replays committed
+    batches over the snapshot. Once the log outgrows the snapshot, ``flush``
+    compacts: the snapshot is rewritten write-then-rename and a new log starts.
+
+    Several processes may append to the same log (``ChannelDatabase``, the
+    fetcher and the mapper's channel write-back): each batch is a single
+    append, and whatever another writer added since ``load`` is folded in
+    before compacting. The log's first line stamps the snapshot it extends; a
+    log whose snapshot was since replaced (the weekly rebuild) is discarded
+    instead of being replayed onto a different database.
+    """
+
+    def __init__(
+        self,
+        path: PathLike,
+        compact_ratio: float = DEFAULT_COMPACT_RATIO,
+        compact_min_bytes: int = DEFAULT_COMPACT_MIN_BYTES,
+    ):
+        self.path = Path(path)
+        self.changes_path = changes_path_for(path)
+        self.compact_ratio = compact_ratio
+        self.compact_min_bytes = compact_min_bytes
+        self.replayed = 0  # changes applied by the last load()
+        self._pending: List[str] = []
+        self._base: Optional[List[int]] = None  # stamp of the snapshot when loaded or compacted
+        self._log_bytes = 0  # size of the log at the last read or write
+        self._applied_bytes = 0  # log offset up to which changes are in the loaded database
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def set_table(self, table: str, value: Any) -> None:
+        """Replace a top-level key (``metadata``, say)."""
+        self._record("set", [table], value)
+
+    def set_item(self, table: str, key: Any, value: Any) -> None:
+        """Replace one entry of a top-level mapping."""
+        self._record("set", [table, str(key)], value)
+
+    def add_members(self, table: str, key: Any, members: Iterable[Any]) -> None:
+        """Union members into a list-valued entry; replayed lists come back sorted."""
+        self._record("add", [table, str(key)], sorted(members))
+
+    def load(self) -> Dict[str, Any]:
+        """Snapshot with the change log replayed; raises FileNotFoundError without a snapshot."""
+        with open(self.path, "r", encoding="utf-8") as handle:
+            db = json.load(handle)
+        self._base = file_stamp(self.path)
+        self._applied_bytes = 0
+        self.replayed = self.replay(db)
+        return db
+
+    def replay(self, db: Dict[str, Any]) -> int:
+        """Apply the committed changes ``db`` hasn't seen yet; returns how many."""
+        changes, self._applied_bytes = self._committed(self._applied_bytes)
+        applied = 0
+        added: Dict[Tuple[str, ...], Tuple[Dict[str, Any], str, set]] = {}
+        for change in changes:
+            applied += self._apply(db, change, added)
+        for container, key, members in added.values():
+            container[key] = sorted(members)
+        return applied
+
+    def journaled_items(self, table: str) -> Dict[str, Any]:
+        """Entries of one table set since the snapshot was written, last write wins.
+
+        For readers that load the snapshot some other way and only need what
+        was journaled for one table.
+        """
+        items: Dict[str, Any] = {}
+        for change in self._committed()[0]:
+            path = change.get("path")
+            if change.get("op") == "set" and isinstance(path, list) and len(path) == 2 and path[0] == table:
+                items[path[1]] = change.get("value")
+        return items
+
+    def flush(self, snapshot: Optional[Callable[[], Dict[str, Any]]] = None) -> bool:
+        """Persist the pending changes; returns True when it compacted instead of appending.
+
+        ``snapshot`` returns the full, current database and is only called to
+        compact. Without one, the changes are always appended.
+        """
+        if snapshot is not None and (self._base is None or self._base != file_stamp(self.path)):
+            # No log for this snapshot yet (first save, or someone rewrote the file)
+            self.compact(snapshot())
+            return True
+        if self._pending:
+            self._append()
+        if snapshot is not None and self._log_bytes > max(self.compact_min_bytes, self.compact_ratio * self._base[0]):
+            self.compact(snapshot())
+            return True
+        return False
+
+    def compact(self, db: Dict[str, Any]) -> None:
+        """Rewrite the snapshot from ``db`` and start an empty change log.
+
+        Batches other processes appended since ``load`` are applied to ``db`` first.
+        """
+        if self._base is not None and self._base == file_stamp(self.path):
+            self.replay(db)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with atomic_write(self.path, fsync=True) as handle:
+            json.dump(db, handle, ensure_ascii=False, separators=(",", ":"))
+        # A crash before the new log is written leaves the old one, which no longer
+        # matches the snapshot's stamp and is discarded on the next load
+        self._pending.clear()
+        self._base = file_stamp(self.path)
+        header = self._header()
+        with open(self.changes_path, "wb") as handle:
+            handle.write(header)
+        self._log_bytes = self._applied_bytes = len(header)
+
+    def discard(self) -> None:
+        """Delete the change log, for writers that just replaced the snapshot wholesale."""
+        self.changes_path.unlink(missing_ok=True)
+        self._log_bytes = self._applied_bytes = 0
+
+    def _header(self) -> bytes:
+        return (json.dumps({"base": file_stamp(self.path)}) + "\n").encode("utf-8")
+
+    def _record(self, op: str, path: List[str], value: Any) -> None:
+        # Serialized now, so later in-place edits by the caller can't leak into the batch
+        self._pending.append(json.dumps({"op": op, "path": path, "value": value}, ensure_ascii=False) + "\n")
+
+    def _append(self) -> None:
+        self._pending.append(json.dumps({"commit": len(self._pending)}) + "\n")
+        batch = "".join(self._pending).encode("utf-8")
+        self._pending.clear()
+        header = self._header()
+        try:
+            with open(self.changes_path, "rb") as handle:
+                current = handle.readline()
+                handle.seek(-1, os.SEEK_END)
+                ends_cleanly = handle.read(1) == b"\n"
+        except OSError:
+            current, ends_cleanly = b"", True
+        if current != header:
+            # No log for the current snapshot yet: start one. Written aside and
+            # renamed, so a concurrent appender never sees a log without header
+            with atomic_write(self.changes_path, "wb", fsync=True) as handle:
+                handle.write(header + batch)
+            self._log_bytes = self._applied_bytes = len(header) + len(batch)
+            return
+        if not ends_cleanly:
+            # Someone's append was cut short: start this batch on a line of its own
+            batch = b"\n" + batch
+        # One write in append mode, so batches from concurrent writers don't interleave
+        with open(self.changes_path, "ab") as handle:
+            handle.write(batch)
+            handle.flush()
+            os.fsync(handle.fileno())
+            self._log_bytes = handle.tell()
+        if self._log_bytes - len(batch) == self._applied_bytes:
+            # Nobody appended in between, so the loaded database is still up to date
+            self._applied_bytes = self._log_bytes
+
+    def _committed(self, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """Changes in the log's committed batches past ``offset``, and where the last one ends.
+
+        Nothing when there is no log or it extends a different snapshot. Lines of
+        a batch cut short by a crash are dropped when the next batch starts.
+        """
+        try:
+            with open(self.changes_path, "rb") as handle:
+                data = handle.read()
+        except FileNotFoundError:
+            return [], 0
+        self._log_bytes = len(data)
+        header_end = data.find(b"\n") + 1
+        try:
+            header = json.loads(data[:header_end]) if header_end else None
+        except ValueError:
+            header = None
+        if not isinstance(header, dict) or header.get("base") != file_stamp(self.path):
+            return [], 0
+
+        position = end = max(offset, header_end)
+        changes: List[Dict[str, Any]] = []
+        batch: List[Dict[str, Any]] = []
+        for line in data[position:].splitlines(keepends=True):
+            position += len(line)
+            try:
+                change = json.loads(line)
+            except ValueError:
+                batch = []
+                continue
+            if not isinstance(change, dict) or "base" in change:
+                batch = []
+            elif "commit" not in change:
+                batch.append(change)
+            else:
+                count = change["commit"]
+                # Leftovers of a torn batch may precede the committed one
+                if isinstance(count, int) and 0 <= count <= len(batch):
+                    changes.extend(batch[len(batch) - count:])
+                batch = []
+                end = position
+        return changes, end
+
+    @staticmethod
+    def _apply(
+        db: Dict[str, Any], change: Dict[str, Any], added: Dict[Tuple[str, ...], Tuple[Dict[str, Any], str, set]]
+    ) -> int:
+        path = change.get("path")
+        if not isinstance(path, list) or len(path) not in (1, 2):
+            return 0
+        if len(path) == 1:
+            container, key = db, path[0]
+        else:
+            container, key = db.setdefault(path[0], {}), path[1]
+        if change.get("op") == "add":
+            # Members accumulate in a set and become a sorted list once the replay ends
+            entry = added.get(tuple(path))
+            if entry is None:
+                entry = added[tuple(path)] = (container, key, set(container.get(key) or ()))
+            entry[2].update(change.get("value") or ())
+        else:
+            # Replacing a whole table orphans the sets pending for its entries
+            for pending_path in [pending for pending in added if pending[:len(path)] == tuple(path)]:
+                del added[pending_path]
+            container[key] = change.get("value")
+        return 1
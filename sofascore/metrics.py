@@ -0,0 +1,161 @@
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+DEFAULT_WINDOW = 4096
+PERCENTILES = (50, 95, 99)
+EXPORT_FORMATS = ("json", "prometheus")
+
+# family -> (label name, help text)
+FAMILIES = {
+    "upstream_request_seconds": ("endpoint", "Latency of SofaScore requests"),
+    "phase_seconds": ("phase", "Time spent in local processing phases"),
+    "upstream_errors_total": ("endpoint", "SofaScore requests that failed"),
+    "upstream_timeouts_total": ("endpoint", "SofaScore requests that hit the per-request timeout"),
+    "upstream_retries_total": ("endpoint", "SofaScore requests retried after a retryable status"),
+    "concurrency_limit": ("client", "Current adaptive concurrency window"),
+    "concurrency_in_flight": ("client", "Requests currently holding a concurrency slot"),
+    "concurrency_backoffs_total": ("client", "Times the adaptive concurrency window was cut"),
+    "request_cache_hits_total": ("endpoint", "Requests answered from the in-memory response cache"),
+    "request_cache_misses_total": ("endpoint", "Requests that started an upstream fetch"),
+    "request_coalesced_total": ("endpoint", "Requests that joined an identical in-flight fetch"),
+    "request_cache_evictions_total": ("endpoint", "Responses evicted from the in-memory cache by the LRU bound"),
+    "request_cache_entries": ("cache", "Responses held in the in-memory cache"),
+}
+
+
+def _nearest_rank(ordered: list, pct: float) -> float:
+    rank = int(round(pct / 100 * len(ordered) + 0.5)) - 1
+    return ordered[min(len(ordered) - 1, max(0, rank))]
+
+
+class LatencyHistogram:
+    """Cumulative bucket counts (for Prometheus) plus a window of recent samples (for percentiles)."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, window: int = DEFAULT_WINDOW):
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+        self.samples: deque = deque(maxlen=window)
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.samples.append(seconds)
+        for index, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.bucket_counts[index] += 1
+                break
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        return _nearest_rank(sorted(self.samples), pct)
+
+    def summary(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {"count": self.count, "sum": round(self.total, 6)}
+        if self.samples:
+            ordered = sorted(self.samples)
+            for pct in PERCENTILES:
+                data[f"p{pct}"] = round(_nearest_rank(ordered, pct), 6)
+            data["max"] = round(ordered[-1], 6)
+        return data
+
+
+class Metrics:
+    """Labelled latency histograms, counters and gauges, exportable as JSON or Prometheus text."""
+
+    def __init__(self, namespace: str = "tvmap"):
+        self.namespace = namespace
+        self.histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self.counters: Dict[Tuple[str, str], int] = {}
+        self.gauges: Dict[Tuple[str, str], float] = {}
+
+    def observe(self, family: str, label: str, seconds: float) -> None:
+        histogram = self.histograms.get((family, label))
+        if histogram is None:
+            histogram = self.histograms[(family, label)] = LatencyHistogram()
+        histogram.observe(seconds)
+
+    @contextmanager
+    def time(self, family: str, label: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(family, label, time.perf_counter() - started)
+
+    def incr(self, family: str, label: str, amount: int = 1) -> None:
+        self.counters[(family, label)] = self.counters.get((family, label), 0) + amount
+
+    def set_gauge(self, family: str, label: str, value: float) -> None:
+        self.gauges[(family, label)] = value
+
+    def histogram(self, family: str, label: str) -> Optional[LatencyHistogram]:
+        return self.histograms.get((family, label))
+
+    def to_dict(self, extra_counters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        data: Dict[str, Any] = {"histograms": {}, "counters": {}, "gauges": {}}
+        for (family, label), histogram in sorted(self.histograms.items()):
+            data["histograms"].setdefault(family, {})[label] = histogram.summary()
+        for (family, label), value in sorted(self.counters.items()):
+            data["counters"].setdefault(family, {})[label] = value
+        for (family, label), value in sorted(self.gauges.items()):
+            data["gauges"].setdefault(family, {})[label] = value
+        for name, value in (extra_counters or {}).items():
+            data["counters"][name] = value
+        return data
+
+    def to_json(self, extra_counters: Optional[Dict[str, Any]] = None) -> str:
+        return json.dumps(self.to_dict(extra_counters), indent=2)
+
+    def to_prometheus(self, extra_counters: Optional[Dict[str, Any]] = None) -> str:
+        lines = []
+        families = sorted({family for family, _ in self.histograms})
+        for family in families:
+            label_name, help_text = FAMILIES.get(family, ("name", family))
+            metric = f"{self.namespace}_{family}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} histogram")
+            for (hist_family, label), histogram in sorted(self.histograms.items()):
+                if hist_family != family:
+                    continue
+                labels = f'{label_name}="{label}"'
+                cumulative = 0
+                for bound, bucket_count in zip(histogram.buckets, histogram.bucket_counts):
+                    cumulative += bucket_count
+                    lines.append(f'{metric}_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f"{metric}_sum{{{labels}}} {histogram.total:.6f}")
+                lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+
+        counter_families = sorted({family for family, _ in self.counters})
+        for family in counter_families:
+            label_name, help_text = FAMILIES.get(family, ("name", family))
+            metric = f"{self.namespace}_{family}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for (counter_family, label), value in sorted(self.counters.items()):
+                if counter_family == family:
+                    lines.append(f'{metric}{{{label_name}="{label}"}} {value}')
+
+        gauge_families = sorted({family for family, _ in self.gauges})
+        for family in gauge_families:
+            label_name, help_text = FAMILIES.get(family, ("name", family))
+            metric = f"{self.namespace}_{family}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} gauge")
+            for (gauge_family, label), value in sorted(self.gauges.items()):
+                if gauge_family == family:
+                    lines.append(f'{metric}{{{label_name}="{label}"}} {value:g}')
+
+        for name, value in sorted((extra_counters or {}).items()):
+            metric = f"{self.namespace}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,80 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+FORMAT_FULL = "full"
+FORMAT_COMPACT = "compact"
+FORMATS = (FORMAT_FULL, FORMAT_COMPACT)
+
+
+def compact_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of ``event`` whose coverage is ``{country_code: [channel ids]}``."""
+    compact = dict(event)
+    compact["tv_coverage"] = {
+        coverage["country_code"]: [channel["id"] for channel in coverage["channels"]]
+        for coverage in event.get("tv_coverage", [])
+    }
+    return compact
+
+
+class CompactEncoder:
+    """Dictionary-encodes events: channel ids per country plus side tables.
+
+    Channel names and country details are emitted once, in ``channels``
+    (id -> name) and ``countries`` (code -> {name, continent, is_eu}), instead
+    of being repeated inside every event.
+    """
+
+    def __init__(self) -> None:
+        self.channels: Dict[str, str] = {}
+        self.countries: Dict[str, Dict[str, Any]] = {}
+
+    def _collect(self, event: Dict[str, Any], channels: Dict[str, str], countries: Dict[str, Dict[str, Any]]) -> None:
+        for coverage in event.get("tv_coverage", []):
+            country_code = coverage["country_code"]
+            if country_code not in self.countries and country_code not in countries:
+                countries[country_code] = {
+                    "name": coverage["country_name"],
+                    "continent": coverage["continent"],
+                    "is_eu": coverage["is_eu"],
+                }
+            for channel in coverage["channels"]:
+                channel_id = str(channel["id"])
+                if channel_id not in self.channels and channel_id not in channels:
+                    channels[channel_id] = channel["name"]
+
+    def encode_stream_event(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """Encode one event for NDJSON; side-table entries ride along the first time they appear."""
+        channels: Dict[str, str] = {}
+        countries: Dict[str, Dict[str, Any]] = {}
+        self._collect(event, channels, countries)
+        self.channels.update(channels)
+        self.countries.update(countries)
+
+        encoded = compact_event(event)
+        if channels:
+            encoded["channels"] = channels
+        if countries:
+            encoded["countries"] = countries
+        return encoded
+
+
+def compact_events(events: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Encode a batch as ``{"events": [...], "channels": {...}, "countries": {...}}``."""
+    encoder = CompactEncoder()
+    encoded: List[Dict[str, Any]] = []
+    for event in events:
+        encoder._collect(event, encoder.channels, encoder.countries)
+        encoded.append(compact_event(event))
+    return {"events": encoded, "channels": encoder.channels, "countries": encoder.countries}
+
+
+def format_events(events: List[Dict[str, Any]], output_format: Optional[str]) -> Any:
+    if output_format == FORMAT_COMPACT:
+        return compact_events(events)
+    return events
+
+
+def format_event(event: Dict[str, Any], output_format: Optional[str]) -> Any:
+    if output_format == FORMAT_COMPACT:
+        batch = compact_events([event])
+        return dict(batch["events"][0], channels=batch["channels"], countries=batch["countries"])
+    return event
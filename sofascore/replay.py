@@ -0,0 +1,129 @@
+import asyncio
+import json
+import random
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+LIVE_BOARD_SUFFIX = "/events/live"
+# Synthetic board copies get ids shifted by multiples of this, well clear of real event ids
+SYNTHETIC_ID_STRIDE = 1_000_000_000
+
+_EVENT_ID = re.compile(r"/event/(\d+)")
+
+
+def fixture_name(endpoint: str) -> str:
+    """File name a recorded ``_get`` endpoint is stored under."""
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", endpoint.strip("/")) + ".json"
+
+
+class RecordingSofascoreAPI:
+    """Wraps a SofascoreAPI-like client and saves every ``_get`` response as a fixture.
+
+    Failures are recorded too, so a replay reproduces the 404s SofaScore
+    returns for events without TV listings.
+    """
+
+    def __init__(self, api: Any, fixture_dir: Path):
+        self.api = api
+        self.fixture_dir = Path(fixture_dir)
+        self.fixture_dir.mkdir(parents=True, exist_ok=True)
+        self.recorded = 0
+
+    def _save(self, endpoint: str, record: Dict[str, Any]) -> None:
+        path = self.fixture_dir / fixture_name(endpoint)
+        path.write_text(json.dumps(dict(record, endpoint=endpoint), ensure_ascii=False), encoding="utf-8")
+        self.recorded += 1
+
+    async def _get(self, endpoint: str) -> Dict[str, Any]:
+        try:
+            data = await self.api._get(endpoint)
+        except Exception as exc:
+            self._save(endpoint, {"error": str(exc)})
+            raise
+        self._save(endpoint, {"body": data})
+        return data
+
+    async def close(self) -> None:
+        await self.api.close()
+
+
+class ReplaySofascoreAPI:
+    """Serves ``_get`` from recorded fixtures with injected latency and jitter.
+
+    With ``board_size`` the recorded live board is tiled (or truncated) to that
+    many events; the copies get synthetic ids whose per-event endpoints map back
+    to the recorded originals, so any board size can be replayed offline.
+    """
+
+    def __init__(
+        self,
+        fixture_dir: Path,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        board_size: Optional[int] = None,
+        seed: Optional[int] = None,
+    ):
+        self.fixture_dir = Path(fixture_dir)
+        if not self.fixture_dir.is_dir():
+            raise FileNotFoundError(f"Fixture directory not found: {self.fixture_dir}")
+        self.latency = latency
+        self.jitter = jitter
+        self.board_size = board_size
+        self._random = random.Random(seed)
+        self._fixtures: Dict[str, Dict[str, Any]] = {}
+        self._aliases: Dict[int, int] = {}
+        self.requests = 0
+        self.misses = 0
+
+    def _load(self, endpoint: str) -> Optional[Dict[str, Any]]:
+        record = self._fixtures.get(endpoint)
+        if record is None:
+            path = self.fixture_dir / fixture_name(endpoint)
+            try:
+                record = json.loads(path.read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                return None
+            self._fixtures[endpoint] = record
+        return record
+
+    def _tile_board(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        events: List[Dict[str, Any]] = body.get("events", [])
+        if not self.board_size or not events:
+            return body
+        tiled = []
+        for index in range(self.board_size):
+            source = events[index % len(events)]
+            copy_number = index // len(events)
+            if copy_number:
+                event_id = source["id"] + copy_number * SYNTHETIC_ID_STRIDE
+                self._aliases[event_id] = source["id"]
+                source = dict(source, id=event_id)
+            tiled.append(source)
+        return dict(body, events=tiled)
+
+    def _resolve_alias(self, endpoint: str) -> str:
+        match = _EVENT_ID.search(endpoint)
+        if match and int(match.group(1)) in self._aliases:
+            original = self._aliases[int(match.group(1))]
+            return f"{endpoint[:match.start(1)]}{original}{endpoint[match.end(1):]}"
+        return endpoint
+
+    async def _get(self, endpoint: str) -> Dict[str, Any]:
+        self.requests += 1
+        delay = self.latency + self._random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        record = self._load(self._resolve_alias(endpoint))
+        if record is None:
+            self.misses += 1
+            raise Exception(f"Failed to fetch {endpoint}: 404")
+        if "error" in record:
+            raise Exception(record["error"])
+        if endpoint.endswith(LIVE_BOARD_SUFFIX):
+            return self._tile_board(record["body"])
+        return record["body"]
+
+    async def close(self) -> None:
+        pass
@@ -0,0 +1,113 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+# Seconds a successful response is served from memory, per endpoint family.
+# Long enough to absorb a burst of identical requests around kickoff, short
+# enough that scores and the live board never look stale.
+DEFAULT_TTLS = {
+    "live_games": 5.0,
+    "event": 5.0,
+    "match_channels": 30.0,
+    "scheduled_events": 60.0,
+}
+DEFAULT_MAX_ENTRIES = 2048
+
+
+class RequestCoalescer:
+    """Single-flight plus a short-TTL LRU in front of upstream calls.
+
+    Concurrent ``get`` calls for the same key share one in-flight fetch, so N
+    consumers asking for the same event's channels cost one request. Successful
+    results are kept for the endpoint's TTL (``0`` disables caching but keeps
+    coalescing); failures are shared with the callers waiting on them but never
+    cached. The least recently used entry is evicted beyond ``max_entries``.
+
+    Cached values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[Dict[str, float]] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        metrics: Any = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.max_entries = max(0, int(max_entries))
+        self.metrics = metrics
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, Any]]" = OrderedDict()
+        self._in_flight: Dict[Tuple[str, Hashable], asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, endpoint: str, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached or in-flight result for ``(endpoint, key)``, else run ``fetch``."""
+        cache_key = (endpoint, key)
+        entry = self._entries.get(cache_key)
+        if entry is not None:
+            if entry[0] > self.clock():
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                self._count("request_cache_hits_total", endpoint)
+                return entry[1]
+            del self._entries[cache_key]
+
+        task = self._in_flight.get(cache_key)
+        if task is not None:
+            self.coalesced += 1
+            self._count("request_coalesced_total", endpoint)
+        else:
+            self.misses += 1
+            self._count("request_cache_misses_total", endpoint)
+            # The fetch runs as its own task so one caller being cancelled
+            # doesn't fail everyone else waiting on it
+            task = asyncio.ensure_future(fetch())
+            self._in_flight[cache_key] = task
+            task.add_done_callback(lambda done: self._settle(cache_key, done))
+        return await asyncio.shield(task)
+
+    def invalidate(self, endpoint: Optional[str] = None, key: Hashable = None) -> int:
+        """Drop cached entries: one key, one endpoint family, or everything."""
+        if endpoint is None:
+            removed = len(self._entries)
+            self._entries.clear()
+        elif key is not None:
+            removed = 1 if self._entries.pop((endpoint, key), None) is not None else 0
+        else:
+            stale = [cache_key for cache_key in self._entries if cache_key[0] == endpoint]
+            for cache_key in stale:
+                del self._entries[cache_key]
+            removed = len(stale)
+        self._publish()
+        return removed
+
+    def _settle(self, cache_key: Tuple[str, Hashable], task: asyncio.Future) -> None:
+        self._in_flight.pop(cache_key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        ttl = self.ttls.get(cache_key[0], 0.0)
+        if ttl <= 0 or not self.max_entries:
+            return
+        self._entries[cache_key] = (self.clock() + ttl, task.result())
+        self._entries.move_to_end(cache_key)
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self.evictions += 1
+            self._count("request_cache_evictions_total", evicted[0])
+        self._publish()
+
+    def _count(self, family: str, endpoint: str) -> None:
+        if self.metrics is not None:
+            self.metrics.incr(family, endpoint)
+
+    def _publish(self) -> None:
+        if self.metrics is not None:
+            self.metrics.set_gauge("request_cache_entries", "memory", len(self._entries))
@@ -0,0 +1,114 @@
+import json
+import time
+from datetime import date as Date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .atomic_file import PathLike, atomic_write
+
+DEFAULT_SCHEDULE_DIRNAME = "schedule"
+# Listings of events that haven't started are re-checked after this long even
+# when the event itself is unchanged: broadcasters are added closer to kickoff
+DEFAULT_UNSTARTED_MAX_AGE = 6 * 3600.0
+# SofaScore status types kept by --status; 'all' keeps everything
+STATUS_TYPES = {
+    "upcoming": ("notstarted",),
+    "past": ("finished",),
+    "live": ("inprogress",),
+}
+
+
+def parse_date_range(text: str, days: int = 1) -> List[str]:
+    """``YYYY-MM-DD`` (plus ``days - 1`` following days) or ``YYYY-MM-DD..YYYY-MM-DD`` -> ISO dates."""
+    start_text, _, end_text = text.partition("..")
+    start = Date.fromisoformat(start_text.strip())
+    end = Date.fromisoformat(end_text.strip()) if end_text else start + timedelta(days=max(1, days) - 1)
+    if end < start:
+        raise ValueError(f"date range ends before it starts: {text}")
+    return [(start + timedelta(days=offset)).isoformat() for offset in range((end - start).days + 1)]
+
+
+def event_date(event: Dict[str, Any]) -> Optional[str]:
+    """UTC calendar date an event starts on, or None when it has no start time."""
+    timestamp = event.get("startTimestamp")
+    if not timestamp:
+        return None
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).date().isoformat()
+
+
+def event_fingerprint(event: Dict[str, Any]) -> str:
+    """Changes whenever SofaScore reschedules or updates an event, so its listing is refetched."""
+    return ":".join(
+        str(part)
+        for part in (
+            event.get("startTimestamp"),
+            event.get("status", {}).get("type"),
+            event.get("changes", {}).get("changeTimestamp"),
+        )
+    )
+
+
+class SchedulePartition:
+    """One day's ``event id -> (fingerprint, match_channels payload)`` entries.
+
+    A ``None`` payload records that SofaScore had no TV listing for the event,
+    so unchanged events without coverage aren't asked about again either.
+    """
+
+    def __init__(self, path: Path, day: str, entries: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.path = path
+        self.day = day
+        self.entries = entries or {}
+        self.dirty = False
+
+    def lookup(
+        self, event_id: int, fingerprint: str, max_age: Optional[float] = None, now: Optional[float] = None
+    ) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """``(found, payload)`` for an unchanged event fetched less than ``max_age`` seconds ago."""
+        entry = self.entries.get(str(event_id))
+        if entry is None or entry.get("fingerprint") != fingerprint:
+            return False, None
+        now = time.time() if now is None else now
+        if max_age is not None and now - entry.get("fetched_at", 0) > max_age:
+            return False, None
+        return True, entry.get("channels")
+
+    def store(self, event_id: int, fingerprint: str, channels: Optional[Dict[str, Any]]) -> None:
+        self.entries[str(event_id)] = {"fingerprint": fingerprint, "fetched_at": time.time(), "channels": channels}
+        self.dirty = True
+
+    def save(self) -> bool:
+        if not self.dirty:
+            return False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"date": self.day, "updated_at": datetime.now().isoformat(), "events": self.entries}
+        # A concurrent reader never sees half a partition
+        with atomic_write(self.path) as handle:
+            json.dump(payload, handle, ensure_ascii=False, separators=(",", ":"))
+        self.dirty = False
+        return True
+
+
+class ScheduleCache:
+    """TV listings for scheduled events, one JSON file per day (``<dir>/YYYY-MM-DD.json``)."""
+
+    def __init__(self, directory: PathLike):
+        self.directory = Path(directory)
+        self._partitions: Dict[str, SchedulePartition] = {}
+
+    def partition(self, day: str) -> SchedulePartition:
+        partition = self._partitions.get(day)
+        if partition is None:
+            path = self.directory / f"{day}.json"
+            entries: Dict[str, Dict[str, Any]] = {}
+            try:
+                with open(path, "r", encoding="utf-8") as handle:
+                    entries = json.load(handle).get("events", {})
+            except (OSError, ValueError):
+                pass
+            partition = self._partitions[day] = SchedulePartition(path, day, entries)
+        return partition
+
+    def save(self) -> int:
+        """Write every partition changed since it was loaded; returns how many were written."""
+        return sum(1 for partition in self._partitions.values() if partition.save())
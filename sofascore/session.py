@@ -0,0 +1,111 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Optional
+
+from .http_pool import DEFAULT_POOL_SIZE, PooledSofascoreAPI
+
+DEFAULT_KEEP_ALIVE = 30.0
+
+
+class SessionManager:
+    """Hands every caller in a process the same pooled SofaScore client.
+
+    One browser (and its warm TLS connections) serves the mapper, the channel
+    database and the harvesters. ``acquire`` is reference counted; after the
+    last ``release`` the client stays open for ``keep_alive`` seconds so
+    back-to-back callers (one ``fetch_competitions`` per sport, say) reuse it,
+    then it is closed. ``close`` shuts it down immediately.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        keep_alive: float = DEFAULT_KEEP_ALIVE,
+        factory: Callable[[int], Any] = PooledSofascoreAPI,
+    ):
+        self.pool_size = max(1, int(pool_size))
+        self.keep_alive = keep_alive
+        self.factory = factory
+        self.api: Optional[Any] = None
+        self.users = 0
+        self.sessions_opened = 0
+        self._idle_close: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def configure(self, pool_size: Optional[int] = None, keep_alive: Optional[float] = None) -> None:
+        if pool_size is not None:
+            self.pool_size = max(1, int(pool_size))
+            if self.api is not None:
+                self.api.ensure_pool_size(self.pool_size)
+        if keep_alive is not None:
+            self.keep_alive = keep_alive
+
+    def acquire(self, pool_size: Optional[int] = None) -> Any:
+        """Return the shared client, creating it (or growing its pool) as needed."""
+        self._drop_if_loop_changed()
+        if self._idle_close is not None:
+            self._idle_close.cancel()
+            self._idle_close = None
+        if pool_size is not None and pool_size > self.pool_size:
+            self.pool_size = int(pool_size)
+        if self.api is None:
+            self.api = self.factory(self.pool_size)
+            self.sessions_opened += 1
+        else:
+            self.api.ensure_pool_size(self.pool_size)
+        self.users += 1
+        return self.api
+
+    async def release(self, api: Any) -> None:
+        """Give a client back; the last user starts the keep-alive countdown."""
+        if api is not self.api:
+            return
+        self.users = max(0, self.users - 1)
+        if self.users:
+            return
+        if self.keep_alive <= 0:
+            await self.close()
+            return
+        loop = asyncio.get_running_loop()
+        self._loop = loop
+        self._idle_close = loop.call_later(self.keep_alive, lambda: loop.create_task(self._close_if_idle()))
+
+    async def _close_if_idle(self) -> None:
+        self._idle_close = None
+        if not self.users:
+            await self.close()
+
+    async def close(self) -> None:
+        if self._idle_close is not None:
+            self._idle_close.cancel()
+            self._idle_close = None
+        api, self.api = self.api, None
+        self.users = 0
+        if api is not None:
+            await api.close()
+
+    @asynccontextmanager
+    async def session(self, pool_size: Optional[int] = None) -> AsyncIterator[Any]:
+        api = self.acquire(pool_size)
+        try:
+            yield api
+        finally:
+            await self.release(api)
+
+    def _drop_if_loop_changed(self) -> None:
+        # Playwright objects belong to the event loop that created them; a new
+        # asyncio.run() needs a fresh client rather than the stale one
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._loop is None:
+            self._loop = loop
+        elif self._loop is not loop:
+            self.api = None
+            self.users = 0
+            self._idle_close = None
+            self._loop = loop
+
+
+shared_sessions = SessionManager()
@@ -8,9 +8,13 @@ if __package__ is None or __package__ == "":
     import sys
 
     sys.path.append(str(Path(__file__).resolve().parents[1]))
+    from sofascore.adaptive_concurrency import HARVEST_CONCURRENCY, HARVEST_MAX_CONCURRENCY, AdaptiveConcurrency
     from sofascore.competitions import fetch_competitions_for_sports
+    from sofascore.session import shared_sessions
 else:  # pragma: no cover - handled when executed as module
+    from .adaptive_concurrency import HARVEST_CONCURRENCY, HARVEST_MAX_CONCURRENCY, AdaptiveConcurrency
     from .competitions import fetch_competitions_for_sports
+    from .session import shared_sessions
 
 from sofascore_wrapper.api import SofascoreAPI
 from sofascore_wrapper.league import League
@@ -18,6 +22,8 @@ from sofascore_wrapper.league import League
 DEFAULT_SPORTS = ["football"]
 DEFAULT_COMPETITIONS_FILE = Path("data/competitions.json")
 DEFAULT_OUTPUT_FILE = Path("data/tournaments_full.json")
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_RETRY_DELAY = 2.0
 
 LEAGUE_CALLS = {
     "overview": League.get_league,
@@ -43,12 +49,25 @@ SEASON_CALLS = {
 }
 
 
-async def safe_call(fn, *args) -> Any:
-    """Execute an async SofaScore call and capture failures as error payloads."""
-    try:
-        return await fn(*args)
-    except Exception as exc:  # noqa: BLE001
-        return {"error": str(exc)}
+async def safe_call(fn, *args, limiter: Optional[AdaptiveConcurrency] = None) -> Any:
+    """Execute an async SofaScore call and capture failures as error payloads.
+
+    With a ``limiter`` the call holds one adaptive concurrency slot, and
+    throttled/5xx answers are retried with exponential backoff first.
+    """
+    attempt = 0
+    while True:
+        try:
+            if limiter is None:
+                return await fn(*args)
+            async with limiter.slot():
+                return await fn(*args)
+        except Exception as exc:  # noqa: BLE001
+            if limiter is not None and attempt < DEFAULT_MAX_RETRIES and limiter.is_backoff(exc):
+                attempt += 1
+                await asyncio.sleep(DEFAULT_RETRY_DELAY * (2 ** (attempt - 1)))
+                continue
+            return {"error": str(exc)}
 
 
 async def load_competitions(
@@ -109,6 +128,7 @@ async def collect_tournament_snapshot(
     *,
     all_seasons: bool,
     season_limit: Optional[int],
+    limiter: Optional[AdaptiveConcurrency] = None,
 ) -> Dict[str, Any]:
     tournament_id = competition.get("tournamentId")
     league = League(api, tournament_id)
@@ -121,9 +141,9 @@ async def collect_tournament_snapshot(
     }
 
     for name, fn in LEAGUE_CALLS.items():
-        snapshot["league"][name] = await safe_call(fn, league)
+        snapshot["league"][name] = await safe_call(fn, league, limiter=limiter)
 
-    seasons_payload = await safe_call(League.get_seasons, league)
+    seasons_payload = await safe_call(League.get_seasons, league, limiter=limiter)
     if isinstance(seasons_payload, dict) and "error" in seasons_payload:
         snapshot["seasonsError"] = seasons_payload
         return snapshot
@@ -142,7 +162,7 @@ async def collect_tournament_snapshot(
         }
 
         for name, fn in SEASON_CALLS.items():
-            season_block[name] = await safe_call(fn, league, season_id)
+            season_block[name] = await safe_call(fn, league, season_id, limiter=limiter)
 
         snapshot["seasonDetails"].append(season_block)
 
@@ -154,32 +174,50 @@ async def build_dataset(
     *,
     all_seasons: bool,
     season_limit: Optional[int],
+    concurrency: int = HARVEST_CONCURRENCY,
+    max_concurrency: int = HARVEST_MAX_CONCURRENCY,
 ) -> Dict[str, Dict[str, Any]]:
-    api = SofascoreAPI()
+    max_concurrency = max(1, concurrency, max_concurrency)
+    api = shared_sessions.acquire(max_concurrency)
+    # Tournaments run in parallel; the AIMD window decides how many requests are in flight
+    limiter = AdaptiveConcurrency(initial=concurrency, maximum=max_concurrency)
+    tournament_slots = asyncio.Semaphore(max_concurrency)
     dataset: Dict[str, Dict[str, Any]] = {}
 
-    try:
-        competitions_list = list(competitions)
-        total = len(competitions_list)
-        for index, competition in enumerate(competitions_list, start=1):
-            sport = competition.get("sportSlug", "unknown")
-            tournament_id = competition.get("tournamentId")
-            name = competition.get("tournamentName", str(tournament_id))
-            category = competition.get("categoryName", "?")
+    async def harvest(index: int, total: int, competition: Dict[str, Any]) -> Dict[str, Any]:
+        tournament_id = competition.get("tournamentId")
+        async with tournament_slots:
             print(
-                f"[{index}/{total}] {sport} | {category} – {name} ({tournament_id})"
+                f"[{index}/{total}] {competition.get('sportSlug', 'unknown')} | "
+                f"{competition.get('categoryName', '?')} – "
+                f"{competition.get('tournamentName', str(tournament_id))} ({tournament_id}) "
+                f"[window {limiter.window}]"
             )
-
-            sport_bucket = dataset.setdefault(sport, {})
-            sport_bucket[str(tournament_id)] = await collect_tournament_snapshot(
+            return await collect_tournament_snapshot(
                 api,
                 competition,
                 all_seasons=all_seasons,
                 season_limit=season_limit,
+                limiter=limiter,
             )
+
+    try:
+        competitions_list = list(competitions)
+        total = len(competitions_list)
+        snapshots = await asyncio.gather(
+            *[
+                harvest(index, total, competition)
+                for index, competition in enumerate(competitions_list, start=1)
+            ]
+        )
+        # Fill the dataset in competitions order, whatever order tournaments finished in
+        for competition, snapshot in zip(competitions_list, snapshots):
+            sport_bucket = dataset.setdefault(competition.get("sportSlug", "unknown"), {})
+            sport_bucket[str(competition.get("tournamentId"))] = snapshot
     finally:
-        await api.close()
+        await shared_sessions.release(api)
 
+    print(f"Adaptive window finished at {limiter.window} ({limiter.backoffs} backoffs)")
     return dataset
 
 
@@ -231,6 +269,21 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Clamp the number of seasons harvested per tournament (applied after --all-seasons).",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=HARVEST_CONCURRENCY,
+        help=(
+            "Initial number of parallel SofaScore requests; grows while responses are "
+            f"healthy and halves on throttling (default: {HARVEST_CONCURRENCY})."
+        ),
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=HARVEST_MAX_CONCURRENCY,
+        help=f"Upper bound for the adaptive request window (default: {HARVEST_MAX_CONCURRENCY}).",
+    )
     return parser.parse_args()
 
 
@@ -246,14 +299,23 @@ async def main_async() -> None:
         competitions,
         all_seasons=args.all_seasons,
         season_limit=args.season_limit,
+        concurrency=args.concurrency,
+        max_concurrency=args.max_concurrency,
     )
 
     args.out.parent.mkdir(parents=True, exist_ok=True)
     args.out.write_text(json.dumps(dataset, indent=args.indent), encoding="utf-8")
 
 
+async def _run() -> None:
+    try:
+        await main_async()
+    finally:
+        await shared_sessions.close()
+
+
 def main() -> None:
-    asyncio.run(main_async())
+    asyncio.run(_run())
 
 
 if __name__ == "__main__":
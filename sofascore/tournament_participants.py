@@ -9,9 +9,25 @@ if __package__ is None or __package__ == "":
     import sys
 
     sys.path.append(str(Path(__file__).resolve().parents[1]))
+    from sofascore.adaptive_concurrency import (
+        DEFAULT_RETRY_STATUSES,
+        HARVEST_CONCURRENCY,
+        HARVEST_MAX_CONCURRENCY,
+        AdaptiveConcurrency,
+        extract_status_code,
+    )
     from sofascore.competitions import fetch_competitions_for_sports
+    from sofascore.session import shared_sessions
 else:  # pragma: no cover - executed when run as module
+    from .adaptive_concurrency import (
+        DEFAULT_RETRY_STATUSES,
+        HARVEST_CONCURRENCY,
+        HARVEST_MAX_CONCURRENCY,
+        AdaptiveConcurrency,
+        extract_status_code,
+    )
     from .competitions import fetch_competitions_for_sports
+    from .session import shared_sessions
 
 from sofascore_wrapper.api import SofascoreAPI
 
@@ -20,20 +36,13 @@ DEFAULT_SPORTS = [
 ]
 DEFAULT_COMPETITIONS_FILE = Path("data/competitions.json")
 DEFAULT_OUTPUT_FILE = Path("data/tournaments_participants.json")
-DEFAULT_REQUEST_DELAY = 0.25
+# Pacing now comes from the adaptive concurrency window; fixed delays stay available
+DEFAULT_REQUEST_DELAY = 0.0
 DEFAULT_REQUEST_JITTER = 0.0
 DEFAULT_RETRY_DELAY = 3.0
 DEFAULT_MAX_RETRIES = 4
-DEFAULT_RETRY_STATUSES = (403, 429, 430, 500, 502, 503)
 DEFAULT_TOURNAMENT_JITTER = 0.0
 
-def _extract_status_code(exc: Exception) -> Optional[int]:
-    message = str(exc)
-    if ":" not in message:
-        return None
-    tail = message.rsplit(":", 1)[-1].strip()
-    return int(tail) if tail.isdigit() else None
-
 
 async def _sleep_with_jitter(base_delay: float, jitter: float) -> None:
     if base_delay <= 0 and jitter <= 0:
@@ -53,6 +62,7 @@ async def fetch_with_retry(
     max_retries: int,
     retry_delay: float,
     retry_statuses: Iterable[int],
+    limiter: Optional[AdaptiveConcurrency] = None,
 ) -> Dict[str, Any]:
     attempt = 0
     retry_codes = set(int(code) for code in retry_statuses)
@@ -61,9 +71,12 @@ async def fetch_with_retry(
         await _sleep_with_jitter(request_delay, request_jitter)
 
         try:
-            return await api._get(endpoint)
+            if limiter is None:
+                return await api._get(endpoint)
+            async with limiter.slot():
+                return await api._get(endpoint)
         except Exception as exc:  # noqa: BLE001
-            status = _extract_status_code(exc)
+            status = extract_status_code(exc)
             attempt += 1
 
             can_retry = (
@@ -193,6 +206,7 @@ async def collect_participants(
     max_retries: int,
     retry_delay: float,
     retry_statuses: Iterable[int],
+    limiter: Optional[AdaptiveConcurrency] = None,
 ) -> Dict[str, Any]:
     tournament_id = competition.get("tournamentId")
 
@@ -211,6 +225,7 @@ async def collect_participants(
             max_retries=max_retries,
             retry_delay=retry_delay,
             retry_statuses=retry_statuses,
+            limiter=limiter,
         )
     except Exception as exc:  # noqa: BLE001
         result["error"] = {"error": str(exc)}
@@ -240,6 +255,7 @@ async def collect_participants(
                 max_retries=max_retries,
                 retry_delay=retry_delay,
                 retry_statuses=retry_statuses,
+                limiter=limiter,
             )
         except Exception as exc:  # noqa: BLE001
             result["teamSets"].append(
@@ -277,38 +293,44 @@ async def build_dataset(
     retry_statuses: Iterable[int],
     existing_index: Dict[str, Dict[str, Dict[str, Any]]],
     force: bool,
+    concurrency: int = HARVEST_CONCURRENCY,
+    max_concurrency: int = HARVEST_MAX_CONCURRENCY,
 ) -> Dict[str, List[Dict[str, Any]]]:
-    api = SofascoreAPI()
+    max_concurrency = max(1, concurrency, max_concurrency)
+    api = shared_sessions.acquire(max_concurrency)
+    # Tournaments run in parallel; the AIMD window decides how many requests are in flight
+    limiter = AdaptiveConcurrency(
+        initial=concurrency, maximum=max_concurrency, backoff_statuses=retry_statuses
+    )
+    tournament_slots = asyncio.Semaphore(max_concurrency)
     results_index: Dict[str, Dict[str, Dict[str, Any]]] = {
         sport: dict(snapshots) for sport, snapshots in existing_index.items()
     }
 
-    try:
-        competitions_list = list(competitions)
-        total = len(competitions_list)
+    async def harvest(index: int, total: int, competition: Dict[str, Any]) -> None:
+        sport = competition.get("sportSlug", "unknown")
+        tournament_id = competition.get("tournamentId")
+        name = competition.get("tournamentName", str(tournament_id))
+        category = competition.get("categoryName", "?")
+        tournament_key = str(tournament_id)
+        existing_snapshot = (
+            results_index.get(sport, {}).get(tournament_key)
+        )
 
-        for index, competition in enumerate(competitions_list, start=1):
-            sport = competition.get("sportSlug", "unknown")
-            tournament_id = competition.get("tournamentId")
-            name = competition.get("tournamentName", str(tournament_id))
-            category = competition.get("categoryName", "?")
-            tournament_key = str(tournament_id)
-            existing_snapshot = (
-                results_index.get(sport, {}).get(tournament_key)
+        if (
+            not force
+            and existing_snapshot
+            and _has_valid_team_data(existing_snapshot)
+        ):
+            print(
+                f"[cached] {sport} | {category} – {name} ({tournament_id})"
             )
+            return
 
-            if (
-                not force
-                and existing_snapshot
-                and _has_valid_team_data(existing_snapshot)
-            ):
-                print(
-                    f"[cached] {sport} | {category} – {name} ({tournament_id})"
-                )
-                continue
-
+        async with tournament_slots:
             print(
-                f"[{index}/{total}] {sport} | {category} – {name} ({tournament_id})"
+                f"[{index}/{total}] {sport} | {category} – {name} ({tournament_id}) "
+                f"[window {limiter.window}]"
             )
 
             await _sleep_with_jitter(tournament_delay, tournament_jitter)
@@ -323,12 +345,25 @@ async def build_dataset(
                 max_retries=max_retries,
                 retry_delay=retry_delay,
                 retry_statuses=retry_statuses,
+                limiter=limiter,
             )
 
-            results_index.setdefault(sport, {})[tournament_key] = snapshot
+        results_index.setdefault(sport, {})[tournament_key] = snapshot
+
+    try:
+        competitions_list = list(competitions)
+        total = len(competitions_list)
+
+        await asyncio.gather(
+            *[
+                harvest(index, total, competition)
+                for index, competition in enumerate(competitions_list, start=1)
+            ]
+        )
     finally:
-        await api.close()
+        await shared_sessions.release(api)
 
+    print(f"Adaptive window finished at {limiter.window} ({limiter.backoffs} backoffs)")
     return _materialize_dataset(results_index, competitions_list)
 
 
@@ -432,6 +467,21 @@ def parse_args() -> argparse.Namespace:
             f"Defaults: {', '.join(map(str, DEFAULT_RETRY_STATUSES))}."
         ),
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=HARVEST_CONCURRENCY,
+        help=(
+            "Initial number of parallel SofaScore requests; grows while responses are "
+            f"healthy and halves on throttling (default: {HARVEST_CONCURRENCY})."
+        ),
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=HARVEST_MAX_CONCURRENCY,
+        help=f"Upper bound for the adaptive request window (default: {HARVEST_MAX_CONCURRENCY}).",
+    )
     parser.add_argument(
         "--resume",
         type=Path,
@@ -469,14 +519,23 @@ async def main_async() -> None:
         retry_statuses=args.retry_status or DEFAULT_RETRY_STATUSES,
         existing_index=existing_index,
         force=args.force,
+        concurrency=args.concurrency,
+        max_concurrency=args.max_concurrency,
     )
 
     args.out.parent.mkdir(parents=True, exist_ok=True)
     args.out.write_text(json.dumps(dataset, indent=args.indent), encoding="utf-8")
 
 
+async def _run() -> None:
+    try:
+        await main_async()
+    finally:
+        await shared_sessions.close()
+
+
 def main() -> None:
-    asyncio.run(main_async())
+    asyncio.run(_run())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,275 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .metrics import EXPORT_FORMATS
+from .output_formats import FORMATS, format_event, format_events
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_LIVE_TTL = 30.0
+DEFAULT_EVENT_TTL = 60.0
+# Keys come from clients (event ids, sport names), so the response cache is an LRU
+DEFAULT_MAX_CACHE_ENTRIES = 1024
+MAX_HEADER_LINES = 100
+
+HTTP_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+}
+
+
+class TVMapServer:
+    """Minimal asyncio HTTP/1.1 JSON service in front of one warm ``CachedTVMapper``.
+
+    Routes:
+        GET /live[?sport=<name>]  live events with TV coverage
+        GET /event/<id>           one event (from the cached live board when present)
+        GET /country/<cc>         live events broadcast in a country, coverage narrowed to it
+        GET /channels/<cc>        channels the database lists for a country
+        GET /channels?q=<name>    channels whose names match the query, best first
+        GET /metrics[?format=json] Prometheus text (or JSON) from the mapper's instrumentation
+
+    Every route accepts ``?format=compact`` for dictionary-encoded output.
+    """
+
+    def __init__(
+        self,
+        mapper: Any,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        *,
+        live_ttl: float = DEFAULT_LIVE_TTL,
+        event_ttl: float = DEFAULT_EVENT_TTL,
+        max_cache_entries: int = DEFAULT_MAX_CACHE_ENTRIES,
+    ):
+        self.mapper = mapper
+        self.host = host
+        self.port = port
+        self.live_ttl = live_ttl
+        self.event_ttl = event_ttl
+        self.max_cache_entries = max(1, int(max_cache_entries))
+        self._cache: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        # Refreshes in progress; entries live only as long as the refresh
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._next_sweep = 0.0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        # Report the bound port (useful with --port 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def _peek(self, key: str) -> Optional[Any]:
+        """Fresh cached value for ``key``, or None; expired entries are dropped."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return entry[1]
+
+    async def _cached(self, key: str, ttl: float, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Serve ``key`` from memory, letting one caller refresh it while others wait."""
+        value = self._peek(key)
+        if value is not None:
+            return value
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._store(key, ttl, done))
+        return await asyncio.shield(task)
+
+    def _store(self, key: str, ttl: float, task: asyncio.Future) -> None:
+        self._in_flight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        now = time.monotonic()
+        self._cache[key] = (now + ttl, task.result())
+        self._cache.move_to_end(key)
+        if now >= self._next_sweep:
+            # Entries nobody asks for again would otherwise wait for LRU eviction
+            for stale in [name for name, (expires, _) in self._cache.items() if expires <= now]:
+                del self._cache[stale]
+            self._next_sweep = now + min(self.live_ttl, self.event_ttl)
+        while len(self._cache) > self.max_cache_entries:
+            self._cache.popitem(last=False)
+
+    async def _live(self, sport: Optional[str]) -> Any:
+        async def refresh() -> Any:
+            events = await self.mapper.get_live_events_with_channels(sport=sport)
+            # Let the mapper look up unknown channels off the request path
+            schedule = getattr(self.mapper, "schedule_channel_resolution", None)
+            if schedule is not None:
+                schedule()
+            return events
+
+        return await self._cached(f"live:{(sport or '').lower()}", self.live_ttl, refresh)
+
+    async def dispatch(self, method: str, target: str) -> Tuple[int, Any]:
+        if method != "GET":
+            return 405, {"error": f"method {method} not allowed"}
+
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        parts = [part for part in url.path.split("/") if part]
+
+        if parts == ["metrics"]:
+            metrics_format = query.get("format", ["prometheus"])[0]
+            if metrics_format not in EXPORT_FORMATS:
+                return 400, {"error": f"format must be one of: {', '.join(EXPORT_FORMATS)}"}
+            return 200, self.mapper.export_metrics(metrics_format)
+
+        output_format = query.get("format", [None])[0]
+        if output_format is not None and output_format not in FORMATS:
+            return 400, {"error": f"format must be one of: {', '.join(FORMATS)}"}
+
+        if parts == ["live"]:
+            sport = query.get("sport", [None])[0]
+            return 200, format_events(await self._live(sport), output_format)
+
+        if len(parts) == 2 and parts[0] == "event":
+            if not parts[1].isdigit():
+                return 400, {"error": "event id must be numeric"}
+            event_id = int(parts[1])
+            # A board that is already warm answers for free; a cold one isn't worth
+            # resolving in full for a single event
+            for event in self._peek("live:") or ():
+                if event["match_id"] == event_id:
+                    return 200, format_event(event, output_format)
+            events = await self._cached(
+                f"event:{event_id}",
+                self.event_ttl,
+                lambda: self.mapper.get_live_events_with_channels(event_id=event_id),
+            )
+            if not events:
+                return 404, {"error": f"event {event_id} not found"}
+            return 200, format_event(events[0], output_format)
+
+        if parts == ["channels"]:
+            search_query = query.get("q", [""])[0]
+            if not search_query.strip():
+                return 400, {"error": "q is required"}
+            return 200, self.mapper.search_channels(search_query)
+
+        if len(parts) == 2 and parts[0] == "channels":
+            return 200, self.mapper.get_channels_for_country(parts[1])
+
+        if len(parts) == 2 and parts[0] == "country":
+            country_code = parts[1].upper()
+            matches = []
+            for event in await self._live(None):
+                coverage = [c for c in event["tv_coverage"] if c["country_code"] == country_code]
+                if coverage:
+                    matches.append(dict(event, tv_coverage=coverage))
+            return 200, format_events(matches, output_format)
+
+        return 404, {"error": f"unknown path {url.path}"}
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request_line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    await self._reject(writer, 400, "request line too long")
+                    break
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._reject(writer, 400, "malformed request line")
+                    break
+
+                headers: Dict[str, str] = {}
+                headers_ended = False
+                try:
+                    # One extra read for the blank line that ends a full set of headers
+                    for _ in range(MAX_HEADER_LINES + 1):
+                        line = await reader.readline()
+                        if not line.strip():
+                            headers_ended = True
+                            break
+                        name, _, value = line.decode("latin-1").partition(":")
+                        headers[name.strip().lower()] = value.strip()
+                except (ValueError, asyncio.LimitOverrunError):
+                    await self._reject(writer, 400, "header line too long")
+                    break
+                if not headers_ended:
+                    # The rest of the headers are unread, so the connection can't be reused
+                    await self._reject(writer, 431, f"more than {MAX_HEADER_LINES} header lines")
+                    break
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = (
+                    connection == "keep-alive"
+                    if version == "HTTP/1.0"
+                    else connection != "close"
+                )
+
+                try:
+                    status, payload = await self.dispatch(method, target)
+                except Exception as exc:  # noqa: BLE001
+                    status, payload = 500, {"error": str(exc)}
+
+                body, content_type = self._encode(payload)
+                await self._respond(writer, status, body, content_type, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _reject(self, writer: asyncio.StreamWriter, status: int, message: str) -> None:
+        """Answer a request that couldn't be read in full, and close the connection."""
+        body, content_type = self._encode({"error": message})
+        await self._respond(writer, status, body, content_type, False)
+
+    def _encode(self, payload: Any) -> Tuple[bytes, str]:
+        """Serialize a response; strings (metrics exports) are sent as plain text."""
+        if isinstance(payload, str):
+            return payload.encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"
+        metrics = getattr(self.mapper, "metrics", None)
+        if metrics is None:
+            return json.dumps(payload, separators=(",", ":")).encode("utf-8"), "application/json"
+        with metrics.time("phase_seconds", "serialization"):
+            return json.dumps(payload, separators=(",", ":")).encode("utf-8"), "application/json"
+
+    @staticmethod
+    async def _respond(
+        writer: asyncio.StreamWriter, status: int, body: bytes, content_type: str, keep_alive: bool
+    ) -> None:
+        head = (
+            f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
@@ -0,0 +1,238 @@
+import argparse
+import asyncio
+import io
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+if __package__ is None or __package__ == "":
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from sofascore.adaptive_concurrency import DEFAULT_CONCURRENCY
+from sofascore.live_events import CachedTVMapper
+from sofascore.output_formats import FORMAT_COMPACT, format_events
+from sofascore.replay import RecordingSofascoreAPI, ReplaySofascoreAPI
+from sofascore.session import shared_sessions
+
+DEFAULT_FIXTURE_DIR = Path("data/fixtures/live")
+DEFAULT_BOARD_SIZES = (20, 200, 1000)
+DEFAULT_LATENCY = 0.08
+DEFAULT_JITTER = 0.04
+DEFAULT_REPEAT = 3
+DEFAULT_TOLERANCE = 0.10
+DEFAULT_SEED = 1234
+
+
+async def record(fixture_dir: Path, sport: Optional[str], limit: Optional[int], concurrency: int) -> int:
+    """Run the live pipeline against SofaScore once, saving every response as a fixture."""
+    api = RecordingSofascoreAPI(shared_sessions.acquire(concurrency), fixture_dir)
+    mapper = CachedTVMapper(
+        concurrency=concurrency,
+        # The pool above has `concurrency` pages; a wider window would queue inside it
+        max_concurrency=concurrency,
+        log_stream=sys.stderr,
+        use_match_cache=False,
+        resolve_misses=False,
+        api=api,
+    )
+    try:
+        events = await mapper.get_live_events_with_channels(sport=sport, limit=limit)
+    finally:
+        await mapper.close()
+        await shared_sessions.close()
+    print(f"Recorded {api.recorded} responses for {len(events)} events into {fixture_dir}", file=sys.stderr)
+    return len(events)
+
+
+async def run_board(
+    fixture_dir: Path,
+    board_size: int,
+    latency: float,
+    jitter: float,
+    concurrency: int,
+    channels_db: str,
+    seed: int,
+) -> Dict[str, Any]:
+    """Replay one board through CachedTVMapper and return wall time plus the mapper's metrics."""
+    api = ReplaySofascoreAPI(fixture_dir, latency=latency, jitter=jitter, board_size=board_size, seed=seed)
+    mapper = CachedTVMapper(
+        channels_db_path=channels_db,
+        concurrency=concurrency,
+        # Pin the adaptive window so the reported concurrency is the one that ran
+        max_concurrency=concurrency,
+        log_stream=io.StringIO(),
+        use_match_cache=False,
+        resolve_misses=False,
+        api=api,
+    )
+    try:
+        started = time.perf_counter()
+        events = await mapper.get_live_events_with_channels()
+        resolved = time.perf_counter()
+        json.dumps(format_events(events, FORMAT_COMPACT), separators=(",", ":"))
+        finished = time.perf_counter()
+    finally:
+        await mapper.close()
+
+    metrics = mapper.metrics.to_dict()
+    return {
+        "events": len(events),
+        "wall_seconds": finished - started,
+        "serialize_seconds": finished - resolved,
+        "upstream_requests": api.requests,
+        "missing_fixtures": api.misses,
+        "latency": metrics["histograms"].get("upstream_request_seconds", {}),
+        "phases": metrics["histograms"].get("phase_seconds", {}),
+    }
+
+
+async def benchmark(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    results = []
+    for board_size in args.boards:
+        runs = [
+            await run_board(
+                args.fixtures, board_size, args.latency, args.jitter, args.concurrency, args.channels_db, args.seed
+            )
+            for _ in range(args.repeat)
+        ]
+        # The median run is reported; its own histograms come along with it
+        runs.sort(key=lambda run: run["wall_seconds"])
+        median = runs[len(runs) // 2]
+        results.append(
+            dict(
+                median,
+                board_size=board_size,
+                events_per_second=median["events"] / median["wall_seconds"] if median["wall_seconds"] else 0.0,
+                wall_seconds_spread=[round(run["wall_seconds"], 4) for run in runs],
+            )
+        )
+    return results
+
+
+def print_report(results: List[Dict[str, Any]], args: argparse.Namespace) -> None:
+    print(
+        f"Replay: {args.fixtures} | latency {args.latency * 1000:.0f}±{args.jitter * 1000:.0f} ms"
+        f" | concurrency {args.concurrency} | median of {args.repeat}"
+    )
+    print(f"{'board':>6} {'events':>7} {'wall s':>8} {'ev/s':>9} {'channels p50/p95/p99 ms':>26} {'coverage ms':>12}")
+    for result in results:
+        channels = result["latency"].get("match_channels", {})
+        percentiles = (
+            "/".join(f"{channels[key] * 1000:.0f}" for key in ("p50", "p95", "p99")) if channels else "-"
+        )
+        coverage = result["phases"].get("coverage_build", {}).get("sum", 0.0) * 1000
+        print(
+            f"{result['board_size']:>6} {result['events']:>7} {result['wall_seconds']:>8.3f}"
+            f" {result['events_per_second']:>9.1f} {percentiles:>26} {coverage:>12.1f}"
+        )
+        if result["missing_fixtures"]:
+            print(f"       ⚠️ {result['missing_fixtures']} requests had no fixture (served as 404)")
+
+
+def compare_baseline(results: List[Dict[str, Any]], baseline_path: Path, tolerance: float) -> bool:
+    """Return False when any board's throughput fell more than ``tolerance`` below the baseline."""
+    baseline = {entry["board_size"]: entry for entry in json.loads(baseline_path.read_text(encoding="utf-8"))}
+    ok = True
+    for result in results:
+        previous = baseline.get(result["board_size"])
+        if not previous or not previous.get("events_per_second"):
+            continue
+        change = result["events_per_second"] / previous["events_per_second"] - 1
+        verdict = "REGRESSION" if change < -tolerance else "ok"
+        ok = ok and verdict == "ok"
+        print(f"board {result['board_size']}: {change * 100:+.1f}% ev/s vs baseline ({verdict})")
+    return ok
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Record SofaScore responses and benchmark the tvmap pipeline offline against them."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser("record", help="Capture the live board and its channel lookups.")
+    record_parser.add_argument(
+        "--fixtures",
+        type=Path,
+        default=DEFAULT_FIXTURE_DIR,
+        help=f"Directory to write fixtures to (default: {DEFAULT_FIXTURE_DIR}).",
+    )
+    record_parser.add_argument("--sport", default=None, help="Record only these sports (comma-separated slugs).")
+    record_parser.add_argument("--limit", type=int, default=None, help="Record at most this many events.")
+    record_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Parallel requests (default: {DEFAULT_CONCURRENCY}).",
+    )
+
+    run_parser = subparsers.add_parser("run", help="Replay recorded boards and report throughput and latency.")
+    run_parser.add_argument(
+        "--fixtures",
+        type=Path,
+        default=DEFAULT_FIXTURE_DIR,
+        help=f"Directory holding recorded fixtures (default: {DEFAULT_FIXTURE_DIR}).",
+    )
+    run_parser.add_argument(
+        "--boards",
+        type=lambda text: [int(size) for size in text.split(",")],
+        default=list(DEFAULT_BOARD_SIZES),
+        help="Comma-separated board sizes to replay (default: 20,200,1000).",
+    )
+    run_parser.add_argument(
+        "--latency",
+        type=float,
+        default=DEFAULT_LATENCY,
+        help=f"Injected per-request latency in seconds (default: {DEFAULT_LATENCY}).",
+    )
+    run_parser.add_argument(
+        "--jitter",
+        type=float,
+        default=DEFAULT_JITTER,
+        help=f"Uniform ± jitter added to the latency in seconds (default: {DEFAULT_JITTER}).",
+    )
+    run_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Mapper concurrency (default: {DEFAULT_CONCURRENCY}).",
+    )
+    run_parser.add_argument(
+        "--repeat", type=int, default=DEFAULT_REPEAT, help=f"Runs per board; the median is reported (default: {DEFAULT_REPEAT})."
+    )
+    run_parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Jitter RNG seed, for reproducible runs.")
+    run_parser.add_argument(
+        "--channels-db",
+        default="data/channels_database.json",
+        help="Channel database used to resolve names (default: data/channels_database.json).",
+    )
+    run_parser.add_argument("--out", type=Path, default=None, help="Save results as JSON (usable as a --baseline).")
+    run_parser.add_argument("--baseline", type=Path, default=None, help="Compare against a previous --out file.")
+    run_parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help=f"Allowed throughput drop vs the baseline before failing (default: {DEFAULT_TOLERANCE}).",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.command == "record":
+        asyncio.run(record(args.fixtures, args.sport, args.limit, args.concurrency))
+        return
+
+    results = asyncio.run(benchmark(args))
+    print_report(results, args)
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    if args.baseline and not compare_baseline(results, args.baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,11 +8,15 @@ import asyncio
 import http.client
 import json
 import os
+import sys
 import time
 from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from sofascore.journaled_store import JournaledStore
+
 # Load environment variables
 load_dotenv()
 
@@ -48,6 +52,10 @@ class SportAPIChannelFetcher:
             'channels_by_country': {},  # ISO_CODE -> [channels]
             'all_channels': {}  # channel_id -> {id, name, countries[], logos[], etc}
         }
+        # Progress saves append only the countries and channels changed since the last one
+        self.store = JournaledStore(output_path)
+        self._changed_countries = set()
+        self._changed_channels = set()
         
         # Load existing database if available
         self._load_existing_database()
@@ -82,8 +90,7 @@ class SportAPIChannelFetcher:
     def _load_existing_database(self):
         """Load existing database to continue from where we left off"""
         try:
-            with open(self.output_path, 'r', encoding='utf-8') as f:
-                existing_db = json.load(f)
+            existing_db = self.store.load()
             
             # Merge with existing data
             if 'metadata' in existing_db:
@@ -114,8 +121,14 @@ class SportAPIChannelFetcher:
                 if channels
             ]
             
-            with open(self.output_path, 'w', encoding='utf-8') as f:
-                json.dump(self.channels_db, f, indent=2, ensure_ascii=False)
+            for iso_code in self._changed_countries:
+                self.store.set_item('channels_by_country', iso_code, self.channels_db['channels_by_country'][iso_code])
+            for channel_str_id in self._changed_channels:
+                self.store.set_item('all_channels', channel_str_id, self.channels_db['all_channels'][channel_str_id])
+            self.store.set_table('metadata', self.channels_db['metadata'])
+            self.store.flush(lambda: self.channels_db)
+            self._changed_countries.clear()
+            self._changed_channels.clear()
             
             print(f"💾 Database saved: {self.channels_db['metadata']['total_channels_found']} channels from {self.channels_db['metadata']['total_countries_processed']} countries")
             return True
@@ -240,6 +253,7 @@ class SportAPIChannelFetcher:
                 if iso_code not in existing_countries:
                     existing_countries.append(iso_code)
                     self.channels_db['all_channels'][channel_str_id]['countries'] = existing_countries
+                    self._changed_channels.add(channel_str_id)
             else:
                 # New channel
                 self.channels_db['all_channels'][channel_str_id] = {
@@ -250,9 +264,11 @@ class SportAPIChannelFetcher:
                     'websites': [channel_info['website']] if channel_info['website'] else [],
                     'first_discovered': channel_info['first_discovered']
                 }
+                self._changed_channels.add(channel_str_id)
         
         # Store channels for this country
         self.channels_db['channels_by_country'][iso_code] = channels
+        self._changed_countries.add(iso_code)
         return channels
     
     async def fetch_all_countries(self, start_from=None, max_countries=None):
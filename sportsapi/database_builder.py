@@ -7,15 +7,27 @@ Creates comprehensive channels_database.json with countries and channels
 import asyncio
 import json
 import os
+import sys
 from datetime import datetime, timedelta
+from pathlib import Path
 from dotenv import load_dotenv
 from channel_fetcher import SportAPIChannelFetcher
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from sofascore.channel_search import DEFAULT_SEARCH_LIMIT, ChannelSearchIndex
+from sofascore.channel_snapshot import snapshot_path_for, write_snapshot
+from sofascore.channel_sqlite import sqlite_path_for, write_channels_sqlite
+from sofascore.journaled_store import JournaledStore
+
 # Load environment variables
 load_dotenv()
 
 class UnifiedDatabaseBuilder:
     def __init__(self):
+        self.output_path = 'data/channels_database.json'
+        # Channels resolved on SofaScore since the last build, read before the
+        # fetcher's progress saves can compact the change log they live in
+        self._journaled_channels = JournaledStore(self.output_path).journaled_items('channels')
         self.fetcher = SportAPIChannelFetcher()
         self.unified_db = {
             'metadata': {
@@ -37,6 +49,7 @@ class UnifiedDatabaseBuilder:
             'countries': {},  # ISO2 -> {name, continent, is_eu}
             'channels': {}    # channel_id -> {id, name, countries[], logo, etc}
         }
+        self._search_index = None
     
     async def build_complete_database(self, max_countries=None, save_progress=True):
         """Build complete unified database from SportAPI"""
@@ -123,15 +136,42 @@ class UnifiedDatabaseBuilder:
         
         print(f"✅ Processed {len(self.unified_db['channels'])} unique channels")
     
+    def _fold_journaled_channels(self, store):
+        """Add channels from the change log that SportAPI didn't return; its own records win"""
+        journaled = {**self._journaled_channels, **store.journaled_items('channels')}
+        folded = 0
+        for channel_id, record in journaled.items():
+            if channel_id not in self.unified_db['channels'] and isinstance(record, dict):
+                self.unified_db['channels'][channel_id] = record
+                folded += 1
+        self.unified_db['metadata']['total_channels'] = len(self.unified_db['channels'])
+        return folded
+    
     def _save_unified_database(self):
         """Save unified database to JSON file"""
         try:
-            output_path = 'data/channels_database.json'
+            output_path = self.output_path
+            store = JournaledStore(output_path)
+            folded = self._fold_journaled_channels(store)
+            if folded:
+                print(f"📓 Kept {folded} channels resolved on SofaScore since the last build")
+            
             with open(output_path, 'w', encoding='utf-8') as f:
                 json.dump(self.unified_db, f, indent=2, ensure_ascii=False)
             
             print(f"\n💾 Unified database saved: {output_path}")
             print(f"📊 Size: {len(self.unified_db['channels'])} channels across {len(self.unified_db['countries'])} countries")
+            
+            # Precompiled copy for fast tvmap.py cold starts (validated against the JSON)
+            snapshot_path = write_snapshot(output_path, self.unified_db)
+            print(f"⚡ Startup snapshot saved: {snapshot_path}")
+            
+            # Indexed copy for `tvmap.py --sqlite` and other processes doing point lookups
+            sqlite_path = write_channels_sqlite(self.unified_db, sqlite_path_for(output_path), output_path)
+            print(f"🗄️ SQLite database saved: {sqlite_path}")
+            
+            # Everything the change log held is in the new files now
+            store.discard()
             return True
             
         except Exception as e:
@@ -189,19 +229,22 @@ class UnifiedDatabaseBuilder:
         
         return channels
     
-    def search_channels(self, query):
-        """Search channels by name"""
-        query = query.lower()
-        results = []
+    def search_channels(self, query, limit=DEFAULT_SEARCH_LIMIT):
+        """Search channels by name: prefix, substring and typo-tolerant, best matches first"""
+        channels = self.unified_db['channels']
+        if self._search_index is None or len(self._search_index) != len(channels):
+            self._search_index = ChannelSearchIndex.from_channels(channels)
         
-        for channel_id, channel_info in self.unified_db['channels'].items():
-            if query in channel_info['name'].lower():
-                result = channel_info.copy()
-                result['country_names'] = [
-                    self.unified_db['countries'].get(cc, {}).get('name', cc) 
-                    for cc in channel_info['countries']
-                ]
-                results.append(result)
+        results = []
+        for channel_id, score in self._search_index.search(query, limit):
+            channel_info = channels[str(channel_id)]
+            result = channel_info.copy()
+            result['country_names'] = [
+                self.unified_db['countries'].get(cc, {}).get('name', cc) 
+                for cc in channel_info['countries']
+            ]
+            result['score'] = score
+            results.append(result)
         
         return results
 
@@ -225,6 +268,8 @@ async def main():
             print("  python database_builder.py --max 50     # Build for first 50 countries")
             print("")
             print("Output: data/channels_database.json")
+            print(f"        {snapshot_path_for('data/channels_database.json')} (fast-start snapshot)")
+            print(f"        {sqlite_path_for('data/channels_database.json')} (indexed SQLite copy)")
             print("Refresh: Weekly (automatic)")
             return
     
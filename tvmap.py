@@ -6,144 +6,686 @@ Uses local channel database for instant channel name resolution
 
 import asyncio
 import json
+import re
+import sqlite3
 import sys
-from datetime import datetime
+import time
+from datetime import datetime, timezone
+from pathlib import Path
 from sofascore_wrapper.match import Match
-from sofascore_wrapper.api import SofascoreAPI
+
+from sofascore.adaptive_concurrency import (DEFAULT_CONCURRENCY, DEFAULT_MAX_CONCURRENCY, AdaptiveConcurrency,
+                                           extract_status_code)
+from sofascore.atomic_file import atomic_write
+from sofascore.channel_cache import DEFAULT_CACHE_FILENAME, MatchChannelsCache
+from sofascore.channel_search import DEFAULT_SEARCH_LIMIT
+from sofascore.channel_snapshot import load_snapshot, write_snapshot
+from sofascore.channel_sqlite import SqliteChannelTable, sqlite_path_for
+from sofascore.channel_table import ChannelTable, CountryRecord
+from sofascore.competitions import load_sport_slugs, write_sport_slugs
+from sofascore.journaled_store import JournaledStore
+from sofascore.metrics import EXPORT_FORMATS, Metrics
+from sofascore.output_formats import FORMAT_COMPACT, FORMAT_FULL, FORMATS, CompactEncoder, format_events
+from sofascore.request_cache import DEFAULT_MAX_ENTRIES, RequestCoalescer
+from sofascore.schedule_cache import (DEFAULT_SCHEDULE_DIRNAME, DEFAULT_UNSTARTED_MAX_AGE, STATUS_TYPES, ScheduleCache,
+                                      event_date, event_fingerprint, parse_date_range)
+from sofascore.session import shared_sessions
+from sofascore.tv_server import DEFAULT_HOST, DEFAULT_PORT, TVMapServer
+
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_RETRY_DELAY = 0.5
+DEFAULT_REQUEST_TIMEOUT = 15.0
+COVERAGE_MEMO_LIMIT = 50000
 
 
 class CachedTVMapper:
-    def __init__(self, channels_db_path='data/channels_database.json'):
-        self.api = SofascoreAPI()
+    def __init__(self, channels_db_path='data/channels_database.json', competitions_path='data/competitions.json',
+                 concurrency=DEFAULT_CONCURRENCY, request_timeout=DEFAULT_REQUEST_TIMEOUT, log_stream=None,
+                 use_match_cache=True, refresh_match_cache=False, api=None, resolve_misses=True,
+                 countries=None, continents=None, eu_only=False, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                 max_retries=DEFAULT_MAX_RETRIES, retry_delay=DEFAULT_RETRY_DELAY, request_cache_ttls=None,
+                 request_cache_size=DEFAULT_MAX_ENTRIES, use_sqlite=False):
+        self.log_stream = log_stream
+        self.concurrency = max(1, int(concurrency))
+        self.max_concurrency = max(self.concurrency, int(max_concurrency))
+        self.request_timeout = request_timeout
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        # Any object with SofascoreAPI's `_get` works here (e.g. a stub in tests);
+        # otherwise borrow the process-wide pooled session and give it back in close()
+        self._owns_session = api is None
+        self.api = api or shared_sessions.acquire(self.max_concurrency)
         self.channels_db_path = channels_db_path
-        self.channels_db = None
+        # The builder's SQLite copy is queried per channel instead of loading the JSON
+        self.use_sqlite = use_sqlite
+        self.channel_table = ChannelTable.empty(channels_db_path)
+        self.competitions_path = competitions_path
+        self._sport_slugs = None
+        # Per-event match_channels cache lives next to the channel database
+        self.match_cache = (
+            MatchChannelsCache(Path(channels_db_path).with_name(DEFAULT_CACHE_FILENAME))
+            if use_match_cache else None
+        )
+        # Scheduled events' listings, one file per day, so re-running a day only refetches what changed
+        self.schedule_cache = (
+            ScheduleCache(Path(channels_db_path).with_name(DEFAULT_SCHEDULE_DIRNAME))
+            if use_match_cache else None
+        )
+        self.refresh_match_cache = refresh_match_cache
+        # Channels SofaScore knows but the database doesn't: resolved in batches and
+        # appended to the database's change log instead of rewriting it
+        self.resolve_misses = resolve_misses
+        self.channel_store = JournaledStore(channels_db_path)
+        self._pending_misses = {}  # channel_id -> (an event that lists it, {country codes})
+        self._unresolvable = set()
+        self._resolve_task = None
+        # Region filters narrow coverage while it is built; uncovered events are dropped
+        self.country_filter = {c.strip().upper() for c in countries if c.strip()} if countries else None
+        self.continent_filter = {c.strip().lower() for c in continents if c.strip()} if continents else None
+        self.eu_only = eu_only
+        self.region_filter = bool(self.country_filter or self.continent_filter or eu_only)
+        self.region_skipped = set()
         self.stats = {
             'api_requests_live': 0,
             'api_requests_channels': 0,
+            'api_requests_events': 0,
+            'api_requests_scheduled': 0,
+            'api_timeouts': 0,
+            'match_cache_hits': 0,
+            'schedule_cache_hits': 0,
             'cache_hits': 0,
-            'cache_misses': 0
+            'cache_misses': 0,
+            'channels_resolved': 0,
+            'events_filtered': 0
         }
         
+        self.metrics = Metrics()
+        # Upstream requests share one AIMD window: it starts at `concurrency`, grows while
+        # SofaScore answers cleanly and halves on throttling/5xx/timeouts
+        self.limiter = AdaptiveConcurrency(
+            initial=self.concurrency, maximum=self.max_concurrency, metrics=self.metrics
+        )
+        # Identical in-flight requests are coalesced and fresh answers kept for a few seconds,
+        # so a burst of consumers around kickoff costs one upstream call per endpoint
+        self.request_cache = RequestCoalescer(
+            ttls=request_cache_ttls, max_entries=request_cache_size, metrics=self.metrics
+        )
+        
         # Load channel database
-        self._load_channels_database()
+        with self.metrics.time('phase_seconds', 'db_load'):
+            self._load_channels_database()
+            self._reset_lookup_caches()
+    
+    def _log(self, message=''):
+        """Print progress/diagnostics; streaming mode points this at stderr"""
+        print(message, file=self.log_stream or sys.stdout)
     
     def _load_channels_database(self):
-        """Load unified channels database"""
+        """Load unified channels database, preferring the precompiled snapshot"""
+        self._close_channel_table()
         try:
-            with open(self.channels_db_path, 'r', encoding='utf-8') as f:
-                self.channels_db = json.load(f)
+            if self.use_sqlite and self._open_channels_sqlite():
+                source = 'SQLite'
+            else:
+                channels_db = load_snapshot(self.channels_db_path)
+                source = 'snapshot'
+                
+                if channels_db is None:
+                    # Snapshot missing or stale: parse the JSON and refresh it for next start
+                    with open(self.channels_db_path, 'r', encoding='utf-8') as f:
+                        channels_db = json.load(f)
+                    source = 'JSON'
+                    try:
+                        write_snapshot(self.channels_db_path, channels_db)
+                    except OSError as e:
+                        self._log(f"⚠️ Could not write channel snapshot: {e}")
+                
+                # Keep only what lookups need; full records are re-read on demand
+                self.channel_table = ChannelTable.from_database(channels_db, self.channels_db_path)
+                del channels_db
+            
+            journaled = self._merge_channels(self.channel_store.journaled_items('channels').values())
+            if journaled:
+                self._log(f"📓 Applied {journaled} channels discovered since the last rebuild")
             
-            channels_count = len(self.channels_db.get('channels', {}))
-            countries_count = len(self.channels_db.get('countries', {}))
+            channels_count = len(self.channel_table)
+            countries_count = len(self.channel_table.countries)
             
-            print(f"✅ Loaded channel cache: {channels_count} channels from {countries_count} countries")
+            self._log(f"✅ Loaded channel cache ({source}): {channels_count} channels from {countries_count} countries")
             
             # Show cache freshness
-            if 'metadata' in self.channels_db and 'last_updated' in self.channels_db['metadata']:
-                last_updated = self.channels_db['metadata']['last_updated'][:10]  # Date only
-                print(f"📅 Cache last updated: {last_updated}")
+            if self.channel_table.metadata.get('last_updated'):
+                last_updated = self.channel_table.metadata['last_updated'][:10]  # Date only
+                self._log(f"📅 Cache last updated: {last_updated}")
             
             return True
             
         except FileNotFoundError:
-            print(f"⚠️ Channel cache not found: {self.channels_db_path}")
-            print("💡 Run 'python sportsapi/database_builder.py' to build cache")
-            self.channels_db = {'channels': {}, 'countries': {}}
+            self._log(f"⚠️ Channel cache not found: {self.channels_db_path}")
+            self._log("💡 Run 'python sportsapi/database_builder.py' to build cache")
+            self.channel_table = ChannelTable.empty(self.channels_db_path)
             return False
         except Exception as e:
-            print(f"❌ Error loading channel cache: {e}")
-            self.channels_db = {'channels': {}, 'countries': {}}
+            self._log(f"❌ Error loading channel cache: {e}")
+            self.channel_table = ChannelTable.empty(self.channels_db_path)
             return False
     
+    def _open_channels_sqlite(self):
+        """Open the SQLite channel database read-only; False (JSON fallback) when it is missing or stale"""
+        sqlite_path = sqlite_path_for(self.channels_db_path)
+        try:
+            table = SqliteChannelTable(sqlite_path)
+        except sqlite3.Error as e:
+            self._log(f"⚠️ Can't open {sqlite_path} ({e}), loading the JSON database instead")
+            return False
+        # Same check as the snapshot's: never serve a copy of an older JSON
+        if not table.matches_source(self.channels_db_path):
+            table.close()
+            self._log(f"⚠️ {sqlite_path} wasn't built from the current JSON, loading the JSON database instead")
+            return False
+        self.channel_table = table
+        return True
+    
+    def _close_channel_table(self):
+        if isinstance(self.channel_table, SqliteChannelTable):
+            self.channel_table.close()
+    
+    def get_channels_for_country(self, country_code):
+        """Channels listed for a country in the database, by id (indexed query with --sqlite)"""
+        return [
+            {'id': channel_id, 'name': self.channel_table.name(channel_id)}
+            for channel_id in self.channel_table.channel_ids_for_country(country_code)
+        ]
+    
+    def search_channels(self, query, limit=DEFAULT_SEARCH_LIMIT):
+        """Channels whose names match every query word, best first (full-text index with --sqlite)"""
+        return [
+            {'id': channel_id, 'name': name}
+            for channel_id, name in self.channel_table.search(query, limit)
+        ]
+    
     def _get_cached_channel_name(self, channel_id):
         """Get channel name from cache (instant lookup)"""
-        if not self.channels_db:
-            return f'Channel {channel_id}'
-        
-        channel_str = str(channel_id)
+        name = self.channel_table.name(channel_id)
         
-        if channel_str in self.channels_db['channels']:
+        if name is not None:
             self.stats['cache_hits'] += 1
-            return self.channels_db['channels'][channel_str]['name']
+            return name
         else:
             self.stats['cache_misses'] += 1
             return f'Channel {channel_id}'
     
     def _get_country_info(self, country_code):
         """Get country information from cache"""
-        if not self.channels_db or 'countries' not in self.channels_db:
-            return {'name': country_code, 'continent': 'Unknown', 'is_eu': False}
-        
-        return self.channels_db['countries'].get(country_code, {
-            'name': country_code,
-            'continent': 'Unknown', 
-            'is_eu': False
-        })
+        return self.channel_table.country(country_code) or CountryRecord.unknown(country_code)
+    
+    def get_channel_record(self, channel_id):
+        """Full database record for a channel (logo, website, ...), loaded from disk on first use"""
+        return self.channel_table.record(channel_id)
+    
+    def _reset_lookup_caches(self):
+        """Rebuild per-country metadata and drop memoized coverage blocks (call after DB changes)"""
+        self._country_meta = dict(self.channel_table.countries)
+        self._region_allowed = {}
+        # (country_code, tuple(channel_ids)) -> (coverage block, cache hits, cache misses)
+        self._coverage_memo = {}
     
-    async def get_live_events_with_channels(self, status='live', sport=None, date=None, event_id=None):
+    async def get_live_events_with_channels(self, status='live', sport=None, date=None, event_id=None, limit=None,
+                                            event_ids=None):
         """Get events with TV channels using cached channel names (super fast!)"""
         
         if event_id:
             # Get specific event
             return await self._get_specific_event(event_id)
         
-        # Get live events
-        if status in ['past', 'upcoming']:
-            print(f"⚠️ {status.title()} events not yet implemented, showing live events")
+        # Process events with cached TV channels, up to `concurrency` at a time
+        jobs = await self._event_jobs(status, sport, limit, event_ids, date)
+        try:
+            processed = await asyncio.gather(*jobs)
+        finally:
+            self._save_schedule()
+        
+        # gather() keeps the original event order
+        return [event_data for event_data in processed if event_data]
+    
+    async def stream_live_events_with_channels(self, status='live', sport=None, date=None, event_id=None, limit=None,
+                                               event_ids=None):
+        """Yield events with TV channels as soon as each one's coverage is resolved"""
+        
+        if event_id:
+            for event_data in await self._get_specific_event(event_id):
+                yield event_data
+            return
         
+        jobs = await self._event_jobs(status, sport, limit, event_ids, date)
+        tasks = [asyncio.ensure_future(job) for job in jobs]
         try:
-            match_obj = Match(self.api, 0)
-            live_games_data = await match_obj.live_games()
-            self.stats['api_requests_live'] += 1
+            for next_done in asyncio.as_completed(tasks):
+                event_data = await next_done
+                if event_data:
+                    yield event_data
+        finally:
+            # Consumer stopped early: don't leave requests running in the background
+            for task in tasks:
+                task.cancel()
+            self._save_schedule()
+    
+    async def _event_jobs(self, status, sport, limit, event_ids, date=None):
+        """Build one bounded coroutine per event, from explicit ids, a schedule or the live board"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        if event_ids:
+            event_ids = event_ids[:limit] if limit else event_ids
+            return [
+                self._resolve_event_bounded(semaphore, event_id, i, len(event_ids))
+                for i, event_id in enumerate(event_ids, 1)
+            ]
+        
+        if date or status in ('past', 'upcoming', 'all'):
+            try:
+                scheduled = await self._fetch_scheduled_events(status, sport, self._scheduled_dates(date), limit)
+            except Exception as e:
+                self._log(f"❌ Error getting scheduled events: {e}")
+                return []
+            return [
+                self._process_scheduled_bounded(semaphore, event, day, i, len(scheduled))
+                for i, (event, day) in enumerate(scheduled, 1)
+            ]
+        
+        try:
+            events = await self._fetch_live_events(status, sport, limit)
+        except Exception as e:
+            self._log(f"❌ Error getting live games: {e}")
+            return []
+        
+        return [
+            self._process_event_bounded(semaphore, event, i, len(events))
+            for i, event in enumerate(events, 1)
+        ]
+    
+    async def watch_live_events(self, interval, sport=None, limit=None, max_cycles=None):
+        """Poll the live board forever, fetching channels only for newly appeared events.
+        
+        Yields (events, added_ids, removed_ids) once per cycle. Known events keep
+        their TV coverage and only get scores/status refreshed from the live feed.
+        """
+        known = {}  # match_id -> event record
+        cycle = 0
+        
+        while True:
+            cycle += 1
+            # Every cycle polls a fresh board, even when the interval is shorter than the memory TTL
+            self.request_cache.invalidate('live_games')
+            try:
+                events = await self._fetch_live_events('live', sport, limit)
+            except Exception as e:
+                self._log(f"❌ Error getting live games: {e}")
+                events = None
             
-            events = live_games_data.get('events', [])
-            print(f"🔍 Found {len(events)} live events")
+            if events is not None:
+                # Events outside the region filter are remembered so they aren't re-resolved
+                self.region_skipped &= {e.get('id') for e in events}
+                new_events = [e for e in events
+                              if e.get('id') and e['id'] not in known and e['id'] not in self.region_skipped]
+                semaphore = asyncio.Semaphore(self.max_concurrency)
+                resolved = await asyncio.gather(*[
+                    self._process_event_bounded(semaphore, event, i, len(new_events))
+                    for i, event in enumerate(new_events, 1)
+                ])
+                # Failed lookups stay unknown and are retried next cycle
+                added_ids = [record['match_id'] for record in resolved if record]
+                for record in resolved:
+                    if record:
+                        known[record['match_id']] = record
+                
+                current = []
+                for event in events:
+                    record = known.get(event.get('id'))
+                    if record is None:
+                        continue
+                    if event['id'] not in added_ids:
+                        record = self._build_event_record(event, record['tv_coverage'])
+                        known[event['id']] = record
+                    current.append(record)
+                
+                current_ids = {record['match_id'] for record in current}
+                removed_ids = [match_id for match_id in known if match_id not in current_ids]
+                for match_id in removed_ids:
+                    del known[match_id]
+                
+                # Names land in the shared coverage blocks, so the next cycle already shows them
+                self.schedule_channel_resolution()
+                yield current, added_ids, removed_ids
             
-            # Filter by sport if specified
-            if sport:
-                events = [e for e in events if sport.lower() in e.get('tournament', {}).get('category', {}).get('name', '').lower()]
-                print(f"🎯 Filtered to {len(events)} {sport} events")
+            if max_cycles and cycle >= max_cycles:
+                return
+            await asyncio.sleep(interval)
+    
+    async def _fetch_live_events(self, status, sport, limit):
+        """Fetch the live board, applying the sport filter and optional limit"""
+        if sport:
+            # Push the filter down to the per-sport live endpoints
+            events = await self._fetch_sport_live_events(self._resolve_sport_slugs(sport))
+        else:
+            async def fetch():
+                data = await self._upstream('live_games', Match(self.api, 0).live_games)
+                self.stats['api_requests_live'] += 1
+                return data
             
-            # Process events with cached TV channels
-            results = []
-            for i, event in enumerate(events[:20], 1):  # Limit to 20 events
-                try:
-                    event_data = await self._process_event_with_cache(event, i, len(events))
-                    if event_data:
-                        results.append(event_data)
-                except Exception as e:
-                    print(f"❌ Error processing event {event.get('id')}: {e}")
-                    continue
+            live_games_data = await self.request_cache.get('live_games', 'all', fetch)
             
-            return results
+            events = live_games_data.get('events', [])
+            self._log(f"🔍 Found {len(events)} live events")
+        
+        if limit:
+            events = events[:limit]
+        
+        return events
+    
+    def _known_sport_slugs(self):
+        """Sport slugs from the competitions dump (loaded once, only when --sport is used)"""
+        if self._sport_slugs is None:
+            try:
+                # The stamped sidecar saves parsing the multi-MB dump for a handful of slugs
+                self._sport_slugs = load_sport_slugs(self.competitions_path)
+                if self._sport_slugs is None:
+                    with open(self.competitions_path, 'r', encoding='utf-8') as f:
+                        competitions = json.load(f)
+                    try:
+                        self._sport_slugs = write_sport_slugs(self.competitions_path, competitions)
+                    except OSError as e:
+                        self._log(f"⚠️ Could not write sport slugs snapshot: {e}")
+                        self._sport_slugs = {c.get('sportSlug', 'football') for c in competitions}
+            except (OSError, ValueError) as e:
+                self._log(f"⚠️ Could not read sport slugs from {self.competitions_path}: {e}")
+                self._sport_slugs = set()
+        return self._sport_slugs
+    
+    def _resolve_sport_slugs(self, sport):
+        """Turn 'football,Ice Hockey' into known SofaScore sport slugs"""
+        known = self._known_sport_slugs()
+        slugs = []
+        for name in sport.split(','):
+            slug = name.strip().lower().replace(' ', '-')
+            if not slug or slug in slugs:
+                continue
+            if known and slug not in known:
+                self._log(f"⚠️ Unknown sport '{name.strip()}' (known: {', '.join(sorted(known))})")
+                continue
+            slugs.append(slug)
+        return slugs
+    
+    async def _fetch_sport_live_events(self, slugs):
+        """Fetch /sport/{slug}/events/live for each sport concurrently, merged and de-duplicated"""
+        async def fetch(slug):
+            async def fetch_upstream():
+                data = await self._upstream('live_games', lambda: self.api._get(f"/sport/{slug}/events/live"))
+                self.stats['api_requests_live'] += 1
+                return data
             
-        except Exception as e:
-            print(f"❌ Error getting live games: {e}")
-            return []
+            data = await self.request_cache.get('live_games', slug, fetch_upstream)
+            return data.get('events', [])
+        
+        results = await asyncio.gather(*[fetch(slug) for slug in slugs], return_exceptions=True)
+        
+        events = []
+        seen = set()
+        errors = []
+        for slug, result in zip(slugs, results):
+            if isinstance(result, Exception):
+                self._log(f"❌ Error getting live {slug} events: {result}")
+                errors.append(result)
+                continue
+            for event in result:
+                if event.get('id') not in seen:
+                    seen.add(event.get('id'))
+                    events.append(event)
+        
+        if errors and len(errors) == len(slugs):
+            raise errors[0]
+        
+        self._log(f"🔍 Found {len(events)} live {', '.join(slugs)} events")
+        return events
+    
+    def _scheduled_dates(self, date):
+        """ISO dates to fetch: a list as given, a 'YYYY-MM-DD[..YYYY-MM-DD]' string, or today"""
+        if not date:
+            return [datetime.now().date().isoformat()]
+        if isinstance(date, str):
+            return parse_date_range(date)
+        return list(date)
+    
+    async def _fetch_scheduled_events(self, status, sport, dates, limit):
+        """Fetch /sport/{slug}/scheduled-events/{date} for every sport and day concurrently.
+        
+        Returns (event, day) pairs sorted by start time, de-duplicated and narrowed to
+        the requested days and status ('upcoming', 'past', 'live' or 'all').
+        """
+        slugs = self._resolve_sport_slugs(sport) if sport else sorted(self._known_sport_slugs()) or ['football']
+        wanted_types = STATUS_TYPES.get(status)
+        
+        async def fetch(slug, day):
+            async def fetch_upstream():
+                data = await self._upstream(
+                    'scheduled_events', lambda: self.api._get(f"/sport/{slug}/scheduled-events/{day}")
+                )
+                self.stats['api_requests_scheduled'] += 1
+                return data
+            
+            data = await self.request_cache.get('scheduled_events', (slug, day), fetch_upstream)
+            return data.get('events', [])
+        
+        pairs = [(slug, day) for day in dates for slug in slugs]
+        results = await asyncio.gather(*[fetch(slug, day) for slug, day in pairs], return_exceptions=True)
+        
+        scheduled = []
+        seen = set()
+        errors = []
+        for (slug, day), result in zip(pairs, results):
+            if isinstance(result, Exception):
+                self._log(f"❌ Error getting {slug} events for {day}: {result}")
+                errors.append(result)
+                continue
+            for event in result:
+                # Neighbouring days' lists overlap around midnight; each event is kept once, on its UTC day
+                event_day = event_date(event) or day
+                if not event.get('id') or event['id'] in seen or event_day not in dates:
+                    continue
+                if wanted_types and event.get('status', {}).get('type') not in wanted_types:
+                    continue
+                seen.add(event['id'])
+                scheduled.append((event, event_day))
+        
+        if errors and len(errors) == len(pairs):
+            raise errors[0]
+        
+        scheduled.sort(key=lambda pair: pair[0].get('startTimestamp') or 0)
+        if limit:
+            scheduled = scheduled[:limit]
+        label = f"{status} " if wanted_types else ""
+        span = dates[0] if len(dates) == 1 else f"{dates[0]}..{dates[-1]}"
+        self._log(f"📅 Found {len(scheduled)} {label}scheduled events on {span}")
+        return scheduled
+    
+    async def _process_scheduled_event(self, event, day, index, total):
+        """Map a scheduled event to channels, reusing its day's cached listing while the event is unchanged"""
+        match_id = event['id']
+        status_type = event.get('status', {}).get('type')
+        partition = self.schedule_cache.partition(day) if self.schedule_cache else None
+        fingerprint = event_fingerprint(event)
+        
+        found = False
+        if partition and not self.refresh_match_cache:
+            max_age = DEFAULT_UNSTARTED_MAX_AGE if status_type == 'notstarted' else None
+            found, channels_data = partition.lookup(match_id, fingerprint, max_age)
+        if found:
+            self.stats['schedule_cache_hits'] += 1
+        else:
+            home_team = event.get('homeTeam', {}).get('name', 'Unknown')
+            away_team = event.get('awayTeam', {}).get('name', 'Unknown')
+            self._log(f"[{index}/{total}] 📅 {home_team} vs {away_team}")
+            try:
+                channels_data = await self._fetch_match_channels(match_id, status_type)
+            except Exception as e:
+                # SofaScore answers 404 when an event has no TV listings (yet); remember that too
+                if extract_status_code(e) != 404:
+                    raise
+                channels_data = None
+            if partition:
+                partition.store(match_id, fingerprint, channels_data if isinstance(channels_data, dict) else None)
+        
+        if channels_data is None:
+            return None
+        tv_coverage = self._process_channels_with_cache(channels_data, match_id)
+        if self._outside_region(match_id, tv_coverage):
+            return None
+        
+        record = self._build_event_record(event, tv_coverage)
+        if event.get('startTimestamp'):
+            record['start_time'] = datetime.fromtimestamp(event['startTimestamp'], tz=timezone.utc).isoformat()
+        return record
+    
+    def _save_schedule(self):
+        """Write the day partitions touched by a scheduled-events run"""
+        if self.schedule_cache:
+            self.schedule_cache.save()
     
     async def _get_specific_event(self, event_id):
-        """Get TV channels for a specific event ID"""
+        """Get details and TV channels for a specific event ID"""
         try:
-            match = Match(self.api, int(event_id))
-            channels_data = await match.match_channels()
-            self.stats['api_requests_channels'] += 1
-            
-            tv_coverage = self._process_channels_with_cache(channels_data)
-            
-            return [{
-                'match_id': int(event_id),
-                'home_team': 'Unknown',
-                'away_team': 'Unknown', 
-                'status': 'Unknown',
-                'tournament': 'Unknown',
-                'sport': 'Unknown',
-                'tv_coverage': tv_coverage
-            }]
+            event_data = await self._resolve_event(int(event_id))
+            return [event_data] if event_data else []
             
+        except asyncio.TimeoutError:
+            self._log(f"⏱️ Timed out getting event {event_id} after {self.request_timeout}s")
+            return []
         except Exception as e:
-            print(f"❌ Error getting event {event_id}: {e}")
+            self._log(f"❌ Error getting event {event_id}: {e}")
             return []
     
+    async def _resolve_event(self, event_id):
+        """Fetch an event's details and its TV channels in parallel"""
+        async def fetch_details():
+            try:
+                return await self._upstream('event', Match(self.api, event_id).get_match)
+            finally:
+                self.stats['api_requests_events'] += 1
+        
+        details, channels_data = await asyncio.gather(
+            self.request_cache.get('event', event_id, fetch_details),
+            self._fetch_match_channels(event_id),
+            return_exceptions=True
+        )
+        
+        if isinstance(details, Exception) and isinstance(channels_data, Exception):
+            raise channels_data
+        if isinstance(details, Exception):
+            self._log(f"⚠️ Details unavailable for event {event_id}: {details}")
+        if isinstance(channels_data, Exception):
+            # SofaScore answers 404 when an event has no TV listings
+            self._log(f"⚠️ No TV channels for event {event_id}: {channels_data}")
+            channels_data = None
+        
+        tv_coverage = self._process_channels_with_cache(channels_data, event_id)
+        if self._outside_region(event_id, tv_coverage):
+            return None
+        
+        event = details.get('event') if isinstance(details, dict) else None
+        if event:
+            return self._build_event_record(event, tv_coverage)
+        
+        return {
+            'match_id': event_id,
+            'home_team': 'Unknown',
+            'away_team': 'Unknown', 
+            'home_score': 0,
+            'away_score': 0,
+            'status': 'Unknown',
+            'tournament': 'Unknown',
+            'sport': 'Unknown',
+            'tv_coverage': tv_coverage
+        }
+    
+    async def _upstream(self, endpoint, call):
+        """Run an upstream call in an adaptive concurrency slot under the per-request timeout.
+        
+        Throttled/5xx answers are retried with exponential backoff; latency and failures are recorded.
+        """
+        timeout = self.request_timeout if self.request_timeout and self.request_timeout > 0 else None
+        attempt = 0
+        while True:
+            try:
+                async with self.limiter.slot():
+                    # Latency excludes time spent queueing for a slot
+                    started = time.perf_counter()
+                    try:
+                        return await asyncio.wait_for(call(), timeout=timeout)
+                    finally:
+                        self.metrics.observe('upstream_request_seconds', endpoint, time.perf_counter() - started)
+            except asyncio.TimeoutError:
+                self.stats['api_timeouts'] += 1
+                self.metrics.incr('upstream_timeouts_total', endpoint)
+                raise
+            except Exception as e:
+                if attempt < self.max_retries and self.limiter.is_backoff(e):
+                    attempt += 1
+                    self.metrics.incr('upstream_retries_total', endpoint)
+                    await asyncio.sleep(self.retry_delay * 2 ** (attempt - 1))
+                    continue
+                self.metrics.incr('upstream_errors_total', endpoint)
+                raise
+    
+    async def _fetch_match_channels(self, match_id, status_type=None):
+        """Fetch TV channels for a match from the TTL cache, else upstream with a timeout"""
+        if self.match_cache and not self.refresh_match_cache:
+            cached = self.match_cache.get(match_id)
+            if cached is not None:
+                self.stats['match_cache_hits'] += 1
+                return cached
+        
+        async def fetch():
+            try:
+                channels_data = await self._upstream('match_channels', Match(self.api, match_id).match_channels)
+            finally:
+                self.stats['api_requests_channels'] += 1
+            if self.match_cache and isinstance(channels_data, dict):
+                self.match_cache.put(match_id, channels_data, status_type)
+            return channels_data
+        
+        # Concurrent consumers of the same event share one upstream request
+        return await self.request_cache.get('match_channels', match_id, fetch)
+    
+    async def _process_event_bounded(self, semaphore, event, index, total):
+        """Process one live-feed event while holding a concurrency slot"""
+        return await self._run_bounded(
+            semaphore, event.get('id'), lambda: self._process_event_with_cache(event, index, total)
+        )
+    
+    async def _process_scheduled_bounded(self, semaphore, event, day, index, total):
+        """Process one scheduled event while holding a concurrency slot"""
+        return await self._run_bounded(
+            semaphore, event.get('id'), lambda: self._process_scheduled_event(event, day, index, total)
+        )
+    
+    async def _resolve_event_bounded(self, semaphore, event_id, index, total):
+        """Resolve one event by id while holding a concurrency slot"""
+        async def resolve():
+            self._log(f"[{index}/{total}] 🔎 Event {event_id}")
+            return await self._resolve_event(event_id)
+        
+        return await self._run_bounded(semaphore, event_id, resolve)
+    
+    async def _run_bounded(self, semaphore, event_id, make_job):
+        """Run one event job under the semaphore; errors are reported, not raised"""
+        async with semaphore:
+            try:
+                return await make_job()
+            except asyncio.TimeoutError:
+                self._log(f"⏱️ Timed out processing event {event_id} after {self.request_timeout}s")
+            except Exception as e:
+                self._log(f"❌ Error processing event {event_id}: {e}")
+            return None
+    
     async def _process_event_with_cache(self, event, index, total):
         """Process a single event with cached channel lookups"""
         match_id = event.get('id')
@@ -152,30 +694,39 @@ class CachedTVMapper:
         
         home_team = event.get('homeTeam', {}).get('name', 'Unknown')
         away_team = event.get('awayTeam', {}).get('name', 'Unknown')
-        print(f"[{index}/{total}] 📺 {home_team} vs {away_team}")
+        self._log(f"[{index}/{total}] 📺 {home_team} vs {away_team}")
         
         # Get TV channels for this match
-        match = Match(self.api, match_id)
-        channels_data = await match.match_channels()
-        self.stats['api_requests_channels'] += 1
+        channels_data = await self._fetch_match_channels(match_id, event.get('status', {}).get('type'))
         
         # Process channels with cache (instant lookups!)
-        tv_coverage = self._process_channels_with_cache(channels_data)
+        tv_coverage = self._process_channels_with_cache(channels_data, match_id)
+        if self._outside_region(match_id, tv_coverage):
+            return None
         
+        return self._build_event_record(event, tv_coverage)
+    
+    def _build_event_record(self, event, tv_coverage):
+        """Build the output record for a live-feed event and its TV coverage"""
         return {
-            'match_id': match_id,
-            'home_team': home_team,
-            'away_team': away_team,
+            'match_id': event.get('id'),
+            'home_team': event.get('homeTeam', {}).get('name', 'Unknown'),
+            'away_team': event.get('awayTeam', {}).get('name', 'Unknown'),
             'home_score': event.get('homeScore', {}).get('current', 0),
             'away_score': event.get('awayScore', {}).get('current', 0),
             'status': event.get('status', {}).get('description', 'Unknown'),
             'tournament': event.get('tournament', {}).get('name', 'Unknown'),
-            'sport': event.get('tournament', {}).get('category', {}).get('name', 'Unknown'),
+            'sport': event.get('tournament', {}).get('category', {}).get('sport', {}).get('name')
+                     or event.get('tournament', {}).get('category', {}).get('name', 'Unknown'),
             'tv_coverage': tv_coverage
         }
     
-    def _process_channels_with_cache(self, channels_data):
+    def _process_channels_with_cache(self, channels_data, match_id=None):
         """Process channel data using cached channel names (instant!)"""
+        with self.metrics.time('phase_seconds', 'coverage_build'):
+            return self._build_tv_coverage(channels_data, match_id)
+    
+    def _build_tv_coverage(self, channels_data, match_id=None):
         tv_coverage = []
         
         if not isinstance(channels_data, dict) or 'countryChannels' not in channels_data:
@@ -184,42 +735,186 @@ class CachedTVMapper:
         for country_code, channel_ids in channels_data['countryChannels'].items():
             if not channel_ids:
                 continue
+            if self.region_filter and not self._in_region(country_code.upper()):
+                continue
             
-            country_code = country_code.upper()
-            country_info = self._get_country_info(country_code)
-            
-            channels = []
-            for channel_id in channel_ids:
-                # Instant lookup from cache!
-                channel_name = self._get_cached_channel_name(channel_id)
-                channels.append({
-                    'id': channel_id,
-                    'name': channel_name
-                })
+            # Big matches repeat the same country/channel combinations across
+            # events and polls, so each block is built once and shared (read-only)
+            key = (country_code.upper(), tuple(channel_ids))
+            entry = self._coverage_memo.get(key)
+            if entry is None:
+                entry = self._build_coverage_block(*key)
+                if len(self._coverage_memo) >= COVERAGE_MEMO_LIMIT:
+                    self._coverage_memo.clear()
+                self._coverage_memo[key] = entry
+            else:
+                self.stats['cache_hits'] += entry[1]
+                self.stats['cache_misses'] += entry[2]
             
-            tv_coverage.append({
-                'country_code': country_code,
-                'country_name': country_info.get('name', country_code),
-                'continent': country_info.get('continent', 'Unknown'),
-                'is_eu': country_info.get('is_eu', False),
-                'channels': channels
-            })
+            if entry[2] and match_id and self.resolve_misses:
+                self._record_misses(entry[0], match_id)
+            tv_coverage.append(entry[0])
         
         return tv_coverage
     
-    def print_events_summary(self, events):
+    def _in_region(self, country_code):
+        """Whether a country passes --country/--continent/--eu (each given filter must match)"""
+        allowed = self._region_allowed.get(country_code)
+        if allowed is None:
+            meta = self._country_meta.get(country_code) or self._get_country_info(country_code)
+            allowed = (
+                (not self.country_filter or country_code in self.country_filter)
+                and (not self.continent_filter or meta.continent.lower() in self.continent_filter)
+                and (not self.eu_only or meta.is_eu)
+            )
+            self._region_allowed[country_code] = allowed
+        return allowed
+    
+    def _outside_region(self, match_id, tv_coverage):
+        """True (and the event is counted as filtered) when a region filter left no coverage"""
+        if not self.region_filter or tv_coverage:
+            return False
+        self.region_skipped.add(match_id)
+        self.stats['events_filtered'] += 1
+        return True
+    
+    def _build_coverage_block(self, country_code, channel_ids):
+        """Build one country's coverage block; returns (block, cache hits, cache misses)"""
+        meta = self._country_meta.get(country_code)
+        if meta is None:
+            meta = self._country_meta[country_code] = self._get_country_info(country_code)
+        
+        hits, misses = self.stats['cache_hits'], self.stats['cache_misses']
+        channels = [
+            # Instant lookup from cache!
+            {'id': channel_id, 'name': self._get_cached_channel_name(channel_id)}
+            for channel_id in channel_ids
+        ]
+        
+        block = {
+            'country_code': country_code,
+            'country_name': meta.name,
+            'continent': meta.continent,
+            'is_eu': meta.is_eu,
+            'channels': channels
+        }
+        return block, self.stats['cache_hits'] - hits, self.stats['cache_misses'] - misses
+    
+    def _record_misses(self, block, match_id):
+        """Remember placeholder channels in a coverage block for the next resolution batch"""
+        for channel in block['channels']:
+            channel_id = channel['id']
+            if channel_id in self.channel_table or channel_id in self._unresolvable:
+                continue
+            pending = self._pending_misses.setdefault(channel_id, (match_id, set()))
+            pending[1].add(block['country_code'])
+    
+    async def resolve_channel_misses(self):
+        """Look up every channel missed so far in one concurrent batch and journal the names found"""
+        pending, self._pending_misses = self._pending_misses, {}
+        if not pending:
+            return 0
+        
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def lookup(channel_id, match_id):
+            # The votes endpoint is the only per-channel lookup and it is scoped to an event
+            async with semaphore:
+                return await self._upstream('channel', lambda: Match(self.api, match_id).get_channel(channel_id))
+        
+        items = list(pending.items())
+        names = await asyncio.gather(
+            *[lookup(channel_id, match_id) for channel_id, (match_id, _) in items],
+            return_exceptions=True
+        )
+        
+        discovered = []
+        now = datetime.now().isoformat()
+        for (channel_id, (match_id, countries)), name in zip(items, names):
+            if isinstance(name, Exception):
+                # Transient failures are retried the next time the channel shows up
+                continue
+            if not name:
+                self._unresolvable.add(channel_id)
+                continue
+            if channel_id in self.channel_table:
+                continue
+            discovered.append({
+                'id': channel_id,
+                'name': name,
+                'countries': sorted(countries),
+                'first_seen': now,
+                'source': 'sofascore',
+            })
+        
+        if not discovered:
+            return 0
+        
+        for record in discovered:
+            self.channel_store.set_item('channels', record['id'], record)
+        try:
+            self.channel_store.flush()
+        except OSError as e:
+            self._log(f"⚠️ Could not journal discovered channels: {e}")
+        self._merge_channels(discovered)
+        
+        # Blocks already handed out (watch/serve keep them) get the real names too
+        names_by_id = {record['id']: record['name'] for record in discovered}
+        for block, _, misses in self._coverage_memo.values():
+            if misses:
+                for channel in block['channels']:
+                    if channel['id'] in names_by_id:
+                        channel['name'] = names_by_id[channel['id']]
+        self._reset_lookup_caches()
+        
+        self.stats['channels_resolved'] += len(discovered)
+        self._log(f"🆕 Resolved {len(discovered)} new channels: "
+                  + ", ".join(f"{record['name']} ({record['id']})" for record in discovered[:5])
+                  + (" ..." if len(discovered) > 5 else ""))
+        return len(discovered)
+    
+    def schedule_channel_resolution(self):
+        """Resolve pending misses in the background; at most one batch runs at a time"""
+        if self._pending_misses and (self._resolve_task is None or self._resolve_task.done()):
+            self._resolve_task = asyncio.ensure_future(self.resolve_channel_misses())
+        return self._resolve_task
+    
+    async def close(self):
+        """Finish background resolution and hand the shared session back"""
+        if self._resolve_task is not None and not self._resolve_task.done():
+            await asyncio.gather(self._resolve_task, return_exceptions=True)
+        if self.match_cache:
+            self.match_cache.close()
+        self._close_channel_table()
+        if self._owns_session:
+            self._owns_session = False
+            await shared_sessions.release(self.api)
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
+    
+    def _merge_channels(self, records):
+        """Add journaled channels the database doesn't have yet; the rebuilt database wins"""
+        return sum(1 for record in records if self.channel_table.add(record))
+    
+    def print_events_summary(self, events, title='LIVE EVENTS'):
         """Print formatted summary of events"""
         if not events:
             print("❌ No events with TV coverage found.")
             return
         
-        print(f"\n🔴 LIVE EVENTS WITH TV COVERAGE ({len(events)} matches):")
+        print(f"\n🔴 {title} WITH TV COVERAGE ({len(events)} matches):")
         print("=" * 70)
         
         for event in events:
             print(f"\n🏆 {event['tournament']} ({event['sport']})")
             print(f"⚽ {event['home_team']} {event['home_score']}-{event['away_score']} {event['away_team']}")
             print(f"📊 Status: {event['status']} | ID: {event['match_id']}")
+            if event.get('start_time'):
+                print(f"🕒 Starts: {event['start_time']}")
             
             if event['tv_coverage']:
                 print("📺 TV Coverage:")
@@ -235,32 +930,89 @@ class CachedTVMapper:
     def print_performance_stats(self):
         """Print performance statistics"""
         total_requests = self.stats['cache_hits'] + self.stats['cache_misses']
-        if total_requests == 0:
+        if total_requests == 0 and not self.metrics.histogram('upstream_request_seconds', 'live_games'):
             return
         
-        cache_hit_rate = (self.stats['cache_hits'] / total_requests) * 100
+        cache_hit_rate = (self.stats['cache_hits'] / total_requests) * 100 if total_requests else 0.0
         
-        print(f"\n⚡ PERFORMANCE STATISTICS:")
-        print("=" * 40)
-        print(f"🎯 Live events API calls: {self.stats['api_requests_live']}")
-        print(f"📡 Channel data API calls: {self.stats['api_requests_channels']}")
-        print(f"💾 Cache hits: {self.stats['cache_hits']}")
-        print(f"❓ Cache misses: {self.stats['cache_misses']}")
-        print(f"📈 Cache hit rate: {cache_hit_rate:.1f}%")
+        self._log(f"\n⚡ PERFORMANCE STATISTICS:")
+        self._log("=" * 40)
+        self._log(f"🎯 Live events API calls: {self.stats['api_requests_live']}")
+        self._log(f"📡 Channel data API calls: {self.stats['api_requests_channels']}")
+        if self.stats['api_requests_events']:
+            self._log(f"🔎 Event detail API calls: {self.stats['api_requests_events']}")
+        if self.stats['api_requests_scheduled'] or self.stats['schedule_cache_hits']:
+            self._log(f"📅 Scheduled-events API calls: {self.stats['api_requests_scheduled']}, "
+                      f"unchanged events reused from the day cache: {self.stats['schedule_cache_hits']}")
+        if self.match_cache:
+            self._log(f"🗄️ Channel data cache hits: {self.stats['match_cache_hits']}")
+        if self.stats['api_timeouts']:
+            self._log(f"⏱️ Upstream timeouts: {self.stats['api_timeouts']}")
+        self._log(f"🎚️ Concurrency window: {self.limiter.window} (max {self.max_concurrency}, "
+                  f"{self.limiter.backoffs} backoffs)")
+        if self.request_cache.hits or self.request_cache.coalesced:
+            self._log(f"🧲 Memory cache hits: {self.request_cache.hits}, "
+                      f"coalesced requests: {self.request_cache.coalesced}")
+        self._log(f"💾 Cache hits: {self.stats['cache_hits']}")
+        self._log(f"❓ Cache misses: {self.stats['cache_misses']}")
+        if self.stats['events_filtered']:
+            self._log(f"🌍 Events outside the region filter: {self.stats['events_filtered']}")
+        if self.stats['channels_resolved']:
+            self._log(f"🆕 New channels resolved: {self.stats['channels_resolved']}")
+        self._log(f"📈 Cache hit rate: {cache_hit_rate:.1f}%")
         
-        if cache_hit_rate > 0:
-            print(f"🚀 Performance improvement: ~{cache_hit_rate:.0f}% faster channel lookups")
+        summary = self.metrics.to_dict()
+        latencies = summary['histograms'].get('upstream_request_seconds', {})
+        if latencies:
+            self._log("⏱️ Upstream latency (p50 / p95 / p99):")
+            for endpoint, h in latencies.items():
+                self._log(f"   {endpoint}: {h['p50'] * 1000:.0f} / {h['p95'] * 1000:.0f} / {h['p99'] * 1000:.0f} ms "
+                          f"({h['count']} calls)")
+        phases = summary['histograms'].get('phase_seconds', {})
+        if phases:
+            self._log("🧮 Local time: " + ", ".join(
+                f"{phase} {h['sum'] * 1000:.1f} ms" for phase, h in phases.items()
+            ))
+        for family in ('upstream_errors_total', 'upstream_retries_total'):
+            for endpoint, count in summary['counters'].get(family, {}).items():
+                self._log(f"⚠️ {family.replace('_total', '').replace('_', ' ').capitalize()} ({endpoint}): {count}")
+    
+    def export_metrics(self, metrics_format='json'):
+        """Export latency histograms, phase timings and counters as JSON or Prometheus text"""
+        if metrics_format == 'prometheus':
+            return self.metrics.to_prometheus(self.stats)
+        return self.metrics.to_json(self.stats)
 
 
 async def main():
-    mapper = CachedTVMapper()
-    
     # Parse command line arguments
-    status = 'live'  # default
+    status = None  # live, or every status when --date is given
     sport = None
-    date = None  
+    date = None
+    days = 1
     event_id = None
+    event_ids = None
     output_json = False
+    output_stream = False
+    output_format = FORMAT_FULL
+    metrics_format = None
+    metrics_file = None
+    limit = None
+    use_match_cache = True
+    refresh_match_cache = False
+    resolve_misses = True
+    use_sqlite = False
+    countries = None
+    continents = None
+    eu_only = False
+    invalidate = None
+    watch_interval = None
+    serve_mode = False
+    host = DEFAULT_HOST
+    port = DEFAULT_PORT
+    concurrency = DEFAULT_CONCURRENCY
+    max_concurrency = DEFAULT_MAX_CONCURRENCY
+    request_timeout = DEFAULT_REQUEST_TIMEOUT
     
     i = 1
     while i < len(sys.argv):
@@ -275,31 +1027,257 @@ async def main():
         elif arg == '--date' and i + 1 < len(sys.argv):
             date = sys.argv[i + 1]
             i += 2
+        elif arg == '--days' and i + 1 < len(sys.argv):
+            days = int(sys.argv[i + 1])
+            i += 2
         elif arg == '--id' and i + 1 < len(sys.argv):
             event_id = sys.argv[i + 1]
             i += 2
+        elif arg == '--ids' and i + 1 < len(sys.argv):
+            try:
+                event_ids = parse_event_ids(sys.argv[i + 1])
+            except ValueError as e:
+                print(f"❌ Invalid --ids: {e}")
+                return
+            i += 2
+        elif arg == '--ids-from' and i + 1 < len(sys.argv):
+            source = sys.argv[i + 1]
+            try:
+                if source == '-':
+                    event_ids = parse_event_ids(sys.stdin.read())
+                else:
+                    with open(source, 'r', encoding='utf-8') as f:
+                        event_ids = parse_event_ids(f.read())
+            except ValueError as e:
+                print(f"❌ Invalid --ids-from '{source}': {e}")
+                return
+            i += 2
         elif arg == '--json':
             output_json = True
             i += 1
+        elif arg == '--format' and i + 1 < len(sys.argv):
+            output_format = sys.argv[i + 1]
+            if output_format not in FORMATS:
+                print(f"❌ Unknown format '{output_format}' (choose from: {', '.join(FORMATS)})")
+                return
+            i += 2
+        elif arg == '--metrics' and i + 1 < len(sys.argv):
+            metrics_format = sys.argv[i + 1]
+            if metrics_format not in EXPORT_FORMATS:
+                print(f"❌ Unknown metrics format '{metrics_format}' (choose from: {', '.join(EXPORT_FORMATS)})")
+                return
+            i += 2
+        elif arg == '--metrics-file' and i + 1 < len(sys.argv):
+            metrics_file = sys.argv[i + 1]
+            i += 2
+        elif arg == '--stream':
+            output_stream = True
+            i += 1
+        elif arg == '--limit' and i + 1 < len(sys.argv):
+            limit = int(sys.argv[i + 1])
+            i += 2
+        elif arg == 'serve':
+            serve_mode = True
+            i += 1
+        elif arg == '--host' and i + 1 < len(sys.argv):
+            host = sys.argv[i + 1]
+            i += 2
+        elif arg == '--port' and i + 1 < len(sys.argv):
+            port = int(sys.argv[i + 1])
+            i += 2
+        elif arg == '--watch' and i + 1 < len(sys.argv):
+            watch_interval = float(sys.argv[i + 1])
+            i += 2
+        elif arg == '--no-cache':
+            use_match_cache = False
+            i += 1
+        elif arg == '--refresh':
+            refresh_match_cache = True
+            i += 1
+        elif arg == '--country' and i + 1 < len(sys.argv):
+            countries = sys.argv[i + 1].split(',')
+            i += 2
+        elif arg == '--continent' and i + 1 < len(sys.argv):
+            continents = sys.argv[i + 1].split(',')
+            i += 2
+        elif arg == '--eu':
+            eu_only = True
+            i += 1
+        elif arg == '--no-resolve':
+            resolve_misses = False
+            i += 1
+        elif arg == '--sqlite':
+            use_sqlite = True
+            i += 1
+        elif arg == '--invalidate' and i + 1 < len(sys.argv):
+            invalidate = sys.argv[i + 1]
+            i += 2
+        elif arg == '--concurrency' and i + 1 < len(sys.argv):
+            concurrency = int(sys.argv[i + 1])
+            i += 2
+        elif arg == '--max-concurrency' and i + 1 < len(sys.argv):
+            max_concurrency = int(sys.argv[i + 1])
+            i += 2
+        elif arg == '--timeout' and i + 1 < len(sys.argv):
+            request_timeout = float(sys.argv[i + 1])
+            i += 2
         elif arg == 'help':
             print_help()
             return
         else:
             i += 1
     
-    # Get events with TV channels
-    events = await mapper.get_live_events_with_channels(
-        status=status, sport=sport, date=date, event_id=event_id
-    )
-    
-    # Output results
-    if output_json:
-        print(json.dumps(events, indent=2))
+    # --date/--days or a non-live --status switch to the scheduled-events feed
+    scheduled = bool(date) or status in ('past', 'upcoming', 'all')
+    if scheduled:
+        status = status or 'all'
+        try:
+            date = parse_date_range(date or datetime.now().date().isoformat(), days)
+        except ValueError as e:
+            print(f"❌ Invalid --date '{date}': {e}")
+            return
     else:
-        mapper.print_events_summary(events)
+        status = 'live'
     
-    # Show performance stats
-    mapper.print_performance_stats()
+    # Line-oriented JSON modes keep stdout pure; progress and stats go to stderr
+    mapper = CachedTVMapper(
+        concurrency=concurrency, max_concurrency=max_concurrency, request_timeout=request_timeout,
+        log_stream=sys.stderr if output_stream or serve_mode or (watch_interval and output_json) else None,
+        use_match_cache=use_match_cache, refresh_match_cache=refresh_match_cache,
+        resolve_misses=resolve_misses, countries=countries, continents=continents, eu_only=eu_only,
+        use_sqlite=use_sqlite
+    )
+    
+    # The mapper borrows the shared session; hand it back however the run ends
+    async with mapper:
+        if invalidate:
+            if not mapper.match_cache:
+                print("⚠️ --invalidate has no effect with --no-cache")
+                return
+            event_ids = None if invalidate == 'all' else [int(x) for x in invalidate.split(',') if x.strip()]
+            removed = mapper.match_cache.invalidate(event_ids)
+            print(f"🗑️ Invalidated {removed} cached channel entries")
+            return
+        
+        if serve_mode:
+            server = TVMapServer(mapper, host, port)
+            await server.start()
+            mapper._log(f"🌐 Serving /live, /event/<id>, /country/<cc> on http://{host}:{server.port}")
+            try:
+                await server.serve_forever()
+            finally:
+                mapper.print_performance_stats()
+                write_metrics(mapper, metrics_format, metrics_file)
+            return
+        
+        if watch_interval:
+            try:
+                await watch(mapper, watch_interval, sport, limit, output_json or output_stream, output_format,
+                            metrics_format, metrics_file)
+            finally:
+                mapper.print_performance_stats()
+                write_metrics(mapper, metrics_format, metrics_file)
+            return
+        
+        if output_stream:
+            encoder = CompactEncoder() if output_format == FORMAT_COMPACT else None
+            async for event in mapper.stream_live_events_with_channels(
+                status=status, sport=sport, date=date, event_id=event_id, limit=limit, event_ids=event_ids
+            ):
+                with mapper.metrics.time('phase_seconds', 'serialization'):
+                    if encoder:
+                        event = encoder.encode_stream_event(event)
+                    line = json.dumps(event, separators=(',', ':'))
+                sys.stdout.write(line + '\n')
+                sys.stdout.flush()
+            await mapper.resolve_channel_misses()
+            mapper.print_performance_stats()
+            write_metrics(mapper, metrics_format, metrics_file)
+            return
+        
+        # Get events with TV channels
+        events = await mapper.get_live_events_with_channels(
+            status=status, sport=sport, date=date, event_id=event_id, limit=limit, event_ids=event_ids
+        )
+        
+        # Output results
+        if output_json:
+            with mapper.metrics.time('phase_seconds', 'serialization'):
+                if output_format == FORMAT_COMPACT:
+                    output = json.dumps(format_events(events, output_format), separators=(',', ':'))
+                else:
+                    output = json.dumps(events, indent=2)
+            print(output)
+        else:
+            mapper.print_events_summary(events, 'SCHEDULED EVENTS' if scheduled else 'LIVE EVENTS')
+        
+        # Fix this run's placeholder names for every later run
+        await mapper.resolve_channel_misses()
+        
+        # Show performance stats
+        mapper.print_performance_stats()
+        write_metrics(mapper, metrics_format, metrics_file)
+
+
+def parse_event_ids(text):
+    """Parse event ids separated by commas and/or whitespace, keeping first-seen order"""
+    event_ids = []
+    for token in re.split(r'[\s,]+', text):
+        if not token:
+            continue
+        if not token.isdigit():
+            raise ValueError(f"'{token}' is not a numeric event id")
+        if int(token) not in event_ids:
+            event_ids.append(int(token))
+    return event_ids
+
+
+def write_metrics(mapper, metrics_format, metrics_file):
+    """Print the metrics export, or replace --metrics-file with it (atomically, for scrapers)"""
+    if not metrics_format and not metrics_file:
+        return
+    if not metrics_format:
+        metrics_format = 'prometheus' if metrics_file.endswith('.prom') else 'json'
+    text = mapper.export_metrics(metrics_format)
+    if not metrics_file:
+        mapper._log(text)
+        return
+    with atomic_write(metrics_file) as f:
+        f.write(text)
+
+
+async def watch(mapper, interval, sport, limit, output_json, output_format=FORMAT_FULL,
+                metrics_format=None, metrics_file=None):
+    """Run the resident poller, printing one report per cycle"""
+    cycle = 0
+    async for events, added_ids, removed_ids in mapper.watch_live_events(interval, sport=sport, limit=limit):
+        cycle += 1
+        if output_json:
+            report = {
+                'cycle': cycle,
+                'timestamp': datetime.now().isoformat(),
+                'added': added_ids,
+                'removed': removed_ids,
+                'events': events
+            }
+            with mapper.metrics.time('phase_seconds', 'serialization'):
+                if output_format == FORMAT_COMPACT:
+                    report.update(format_events(events, output_format))
+                line = json.dumps(report, separators=(',', ':'))
+            sys.stdout.write(line + '\n')
+            sys.stdout.flush()
+            if metrics_file:
+                write_metrics(mapper, metrics_format, metrics_file)
+            continue
+        
+        if metrics_file:
+            write_metrics(mapper, metrics_format, metrics_file)
+        mapper._log(f"\n🔄 [{datetime.now():%H:%M:%S}] Cycle {cycle}: {len(events)} live "
+                    f"(+{len(added_ids)} new, -{len(removed_ids)} ended)")
+        if not added_ids:
+            continue
+        added = set(added_ids)
+        mapper.print_events_summary([event for event in events if event['match_id'] in added])
 
 
 def print_help():
@@ -310,19 +1288,52 @@ def print_help():
     print("Usage:")
     print("  python tvmap.py [options]")
     print("  python sofascore/live_events.py [options]")
+    print("  python tvmap.py serve [--host <addr>] [--port <n>]")
     print("")
     print("Options:")
-    print("  --status <value>    Event status: live/past/upcoming/all (default: live)")
-    print("  --sport <name>      Filter by sport (e.g., football, basketball)")
-    print("  --date <YYYY-MM-DD> Filter by date (future feature)")
+    print("  --status <value>    Event status: live/past/upcoming/all (default: live; all with --date)")
+    print("  --sport <slugs>     Sports to fetch, comma-separated (e.g., football,basketball)")
+    print("  --date <YYYY-MM-DD> Scheduled events for a day, or a range: YYYY-MM-DD..YYYY-MM-DD")
+    print("  --days <n>          With --date: that day and the following n-1 days (default: 1)")
     print("  --id <event_id>     Get specific event by ID")
+    print("  --ids <a,b,c>       Resolve many event IDs concurrently")
+    print("  --ids-from <file>   Read event IDs from a file, or '-' for stdin")
+    print("  --country <cc,..>   Only coverage in these countries (e.g., PT,BR)")
+    print("  --continent <name>  Only coverage in these continents (e.g., Europe,'South America')")
+    print("  --eu                Only coverage in EU member states")
     print("  --json              Output in JSON format")
+    print("  --format <name>     JSON shape: full (default) or compact (channel ids + side tables)")
+    print("  --metrics <fmt>     Print latency histograms/timings/counters: json or prometheus")
+    print("  --metrics-file <p>  Write metrics to a file (each cycle in --watch; .prom => prometheus)")
+    print("  --stream            Stream one compact JSON line per event (NDJSON)")
+    print("  --limit <n>         Process at most n events (default: all)")
+    print(f"  --host <addr>       serve: bind address (default: {DEFAULT_HOST})")
+    print(f"  --port <n>          serve: listen port (default: {DEFAULT_PORT})")
+    print("  --watch <secs>      Keep polling; fetch channels only for new live events")
+    print("  --no-cache          Skip the per-event and per-day schedule channel caches")
+    print("  --refresh           Re-fetch channels and overwrite cached entries")
+    print("  --no-resolve        Don't look up or journal channels missing from the database")
+    print("  --sqlite            Query data/channels_database.sqlite per channel instead of loading the JSON")
+    print("  --invalidate <ids>  Drop cached channels for ids (comma-separated) or 'all'")
+    print(f"  --concurrency <n>   Initial parallel requests; adapts to SofaScore (default: {DEFAULT_CONCURRENCY})")
+    print(f"  --max-concurrency <n> Upper bound for the adaptive window (default: {DEFAULT_MAX_CONCURRENCY})")
+    print(f"  --timeout <secs>    Per-request timeout, 0 disables (default: {DEFAULT_REQUEST_TIMEOUT:g})")
     print("")
     print("Examples:")
     print("  python tvmap.py                           # Live events")
     print("  python tvmap.py --sport football          # Football only")
+    print("  python tvmap.py --sport tennis,basketball # Several sports, fetched concurrently")
     print("  python tvmap.py --id 13472687            # Specific event")
+    print("  python tvmap.py --status upcoming --days 7 --json  # A week of listings (TV guide)")
+    print("  python tvmap.py --date 2024-05-01..2024-05-03 --sport football  # Date range")
+    print("  python tvmap.py --ids-from ids.txt --stream  # Batch lookup, NDJSON")
+    print("  python tvmap.py --json --format compact  # Dictionary-encoded JSON")
     print("  python tvmap.py --json                   # JSON output")
+    print("  python tvmap.py --country PT,BR          # Only events broadcast in Portugal or Brazil")
+    print("  python tvmap.py --stream | jq .match_id  # NDJSON as events resolve")
+    print("  python tvmap.py --watch 60 --json        # Resident poller, one JSON line per cycle")
+    print("  python tvmap.py serve --port 8080        # JSON API: /live, /event/<id>, /country/<cc>")
+    print("  python tvmap.py --concurrency 16         # Faster fan-out on busy days")
     print("")
     print("Features:")
     print("  ✅ Instant channel name lookups (local cache)")
@@ -333,5 +1344,16 @@ def print_help():
     print("  ✅ SportAPI compatibility (100% verified)")
 
 
+async def run():
+    try:
+        await main()
+    finally:
+        await shared_sessions.close()
+
+
 if __name__ == '__main__':
-    asyncio.run(main())
\ No newline at end of file
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        # --watch runs until interrupted; stats were already printed on the way out
+        pass
\ No newline at end of file